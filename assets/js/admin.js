@@ -63,6 +63,31 @@ const AdminApp = {
         }
     },
 
+    // Direct upload: the image goes straight to Cloudinary, only its URL reaches our API
+    async uploadDirect(file, projectId = null) {
+        const params = await this.request('/uploads/signature', {
+            method: 'POST',
+            body: JSON.stringify(projectId ? { project_id: Number(projectId) } : {})
+        });
+        if (!params || params.error) return null;
+
+        const body = new FormData();
+        body.append('file', file);
+        body.append('api_key', params.api_key);
+        body.append('timestamp', params.timestamp);
+        body.append('signature', params.signature);
+        body.append('folder', params.folder);
+
+        try {
+            const res = await fetch(params.upload_url, { method: 'POST', body });
+            const result = await res.json();
+            return result.secure_url || null;
+        } catch (error) {
+            console.error('Direct upload failed:', error);
+            return null;
+        }
+    },
+
     // UI Helpers
     showToast(message, type = 'success') {
         console.log(`[${type}] ${message}`);
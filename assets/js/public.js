@@ -6,10 +6,12 @@
 const PUBLIC_API_BASE = 'https://cvisual.onrender.com/api';
 
 const CVisual = {
-    async fetchPortfolio() {
+    async fetchPortfolio(filters = {}) {
         try {
             this.showLoader();
-            const res = await fetch(`${PUBLIC_API_BASE}/portfolio`);
+            // Optional server-side filters: category, industry, fields (and limit/cursor for paging)
+            const query = new URLSearchParams(filters).toString();
+            const res = await fetch(`${PUBLIC_API_BASE}/portfolio${query ? `?${query}` : ''}`);
             this.hideLoader();
             return await res.json();
         } catch (e) {
@@ -19,6 +21,20 @@ const CVisual = {
         }
     },
 
+    async fetchProject(id) {
+        try {
+            this.showLoader();
+            // Full project (challenge, solution, gallery, metrics) for the detail view
+            const res = await fetch(`${PUBLIC_API_BASE}/portfolio/${id}`);
+            this.hideLoader();
+            return await res.json();
+        } catch (e) {
+            this.hideLoader();
+            console.error('Failed to fetch project:', e);
+            return null;
+        }
+    },
+
     async submitContact(data) {
         try {
             this.showLoader();
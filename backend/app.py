@@ -4,64 +4,94 @@ from flask_cors import CORS
 from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
 from werkzeug.security import generate_password_hash, check_password_hash
 from dotenv import load_dotenv
-from flask_migrate import Migrate
 from models import db, Admin, Project, ProjectImage, ProjectMetric, Service, ContactInquiry, NewsletterSubscriber
 from routes import api
-import cloudinary
-
-load_dotenv()
-
-app = Flask(__name__)
-CORS(app) # Enable CORS for all routes
-
-# Render provides 'postgres://', but SQLAlchemy 1.4+ requires 'postgresql://'
-database_url = os.getenv('DATABASE_URL')
-if database_url and database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
-
-# Configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = database_url or 'sqlite:///cvisual.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'default-secret-key')
-
-db.init_app(app)
-migrate = Migrate(app, db)
-jwt = JWTManager(app)
-
-app.register_blueprint(api, url_prefix='/api')
-
-# Debug environment loading
-print(f"DEBUG: Current Working Directory: {os.getcwd()}")
-print(f"DEBUG: .env file exists: {os.path.exists('.env')}")
-
-# Cloudinary configuration
-# Try separate variables first
-cloud_name = os.getenv('CLOUDINARY_CLOUD_NAME')
-api_key = os.getenv('CLOUDINARY_API_KEY')
-api_secret = os.getenv('CLOUDINARY_API_SECRET')
-cloudinary_url = os.getenv('CLOUDINARY_URL')
-
-if cloudinary_url:
-    print("DEBUG: CLOUDINARY_URL found, using it.")
-    cloudinary.config(cloudinary_url = cloudinary_url)
-elif all([cloud_name, api_key, api_secret]):
-    print("DEBUG: Individual Cloudinary variables found, using them.")
-    cloudinary.config(
-      cloud_name = cloud_name,
-      api_key = api_key,
-      api_secret = api_secret
-    )
-else:
-    print("WARNING: No valid Cloudinary configuration found in .env!")
-    print(f"DEBUG: CLOUDINARY_CLOUD_NAME: {bool(cloud_name)}")
-    print(f"DEBUG: CLOUDINARY_API_KEY: {bool(api_key)}")
-    print(f"DEBUG: CLOUDINARY_API_SECRET: {bool(api_secret)}")
-
-# Routes will be added here
-
-@app.route('/')
-def home():
-    return jsonify({"message": "CVisual API is running"})
+from cache import response_cache
+from db_pool import engine_options, pool_metrics
+from contact_queue import contact_queue
+from metrics import request_metrics
+from profiling import request_profiler
+from compression import response_compressor
+from json_provider import init_json_provider
+
+def create_app(config=None):
+    """Build the Flask app.
+
+    Cloudinary is configured on first upload (see uploads.cloudinary_config)
+    and Flask-Migrate only for the `flask db` CLI and manage_db.py, so a
+    cold web worker imports neither.
+    """
+    load_dotenv()
+
+    app = Flask(__name__)
+    CORS(app) # Enable CORS for all routes
+
+    # Render provides 'postgres://', but SQLAlchemy 1.4+ requires 'postgresql://'
+    database_url = os.getenv('DATABASE_URL')
+    if database_url and database_url.startswith("postgres://"):
+        database_url = database_url.replace("postgres://", "postgresql://", 1)
+
+    # Configuration
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_url or 'sqlite:///cvisual.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'default-secret-key')
+    app.config['UPLOAD_CONCURRENCY'] = int(os.getenv('UPLOAD_CONCURRENCY', 4))
+    app.config['DB_POOL_WARM'] = int(os.getenv('DB_POOL_WARM', 2))
+
+    # Cloudinary (CLOUDINARY_URL wins over the separate variables)
+    app.config['CLOUDINARY_URL'] = os.getenv('CLOUDINARY_URL')
+    app.config['CLOUDINARY_CLOUD_NAME'] = os.getenv('CLOUDINARY_CLOUD_NAME')
+    app.config['CLOUDINARY_API_KEY'] = os.getenv('CLOUDINARY_API_KEY')
+    app.config['CLOUDINARY_API_SECRET'] = os.getenv('CLOUDINARY_API_SECRET')
+
+    # Background jobs (see worker.py)
+    app.config['ADMIN_NOTIFY_EMAIL'] = os.getenv('ADMIN_NOTIFY_EMAIL')
+    app.config['SMTP_HOST'] = os.getenv('SMTP_HOST', 'localhost')
+    app.config['SMTP_PORT'] = int(os.getenv('SMTP_PORT', 25))
+    app.config['SMTP_USERNAME'] = os.getenv('SMTP_USERNAME')
+    app.config['SMTP_PASSWORD'] = os.getenv('SMTP_PASSWORD')
+    app.config['SMTP_FROM'] = os.getenv('SMTP_FROM')
+    app.config['SMTP_STARTTLS'] = os.getenv('SMTP_STARTTLS', '0') == '1'
+    app.config['DEFER_GALLERY_UPLOADS'] = os.getenv('DEFER_GALLERY_UPLOADS', '0') == '1'
+
+    if config:
+        app.config.update(config)
+    # Pool options follow the database actually used, after any override of its URI
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config['SQLALCHEMY_DATABASE_URI']))
+
+    init_json_provider(app)
+    db.init_app(app)
+    with app.app_context():
+        pool_metrics.attach(db.engine)
+        request_metrics.attach(db.engine)
+    request_metrics.init_app(app) # First, so its timing covers the other request hooks
+    request_profiler.init_app(app) # No-op unless PROFILING=1
+    response_compressor.init_app(app) # Its hook runs before the metrics one, so sizes are bytes on the wire
+    response_cache.init_app(app)
+    contact_queue.init_app(app)
+    JWTManager(app)
+
+    # Set by the flask command before it loads the app
+    if os.getenv('FLASK_RUN_FROM_CLI'):
+        init_migrate(app)
+
+    app.register_blueprint(api, url_prefix='/api')
+
+    @app.route('/')
+    def home():
+        return jsonify({"message": "CVisual API is running"})
+
+    return app
+
+def init_migrate(app):
+    # Alembic is the heaviest import we have; only pay for it when migrating
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        from search import include_object
+        Migrate(app, db, include_object=include_object)
+    return app.extensions['migrate']
+
+app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True)
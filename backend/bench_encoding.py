@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Ensure current directory is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from app import app
+from models import db, Project, ContactInquiry
+from benchmark import SCENARIOS
+from compression import response_compressor, brotli
+from json_provider import OrjsonProvider, orjson
+
+# Micro-benchmark of the response encoding path, per GET route: JSON encode time with
+# the stdlib provider vs orjson, and bytes on the wire identity vs gzip vs brotli (with
+# the time each compression takes). Runs in-process against DATABASE_URL; seed it first
+# (seed_data.py) so bodies have realistic sizes.
+
+def best_time(fn, min_seconds=0.2, max_runs=200):
+    # Best of repeated runs, in milliseconds: the least noisy estimate of the pure cost
+    times = []
+    deadline = time.perf_counter() + min_seconds
+    while len(times) < max_runs and (len(times) < 3 or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times) * 1000
+
+def fetch_bodies(routes):
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='bench-encoding')}"}
+        ids = {
+            'projects': [db.session.query(Project.id).order_by(Project.id).limit(1).scalar() or 0],
+            'inquiries': [db.session.query(ContactInquiry.id).order_by(ContactInquiry.id).limit(1).scalar() or 0],
+        }
+    client = app.test_client()
+    bodies = []
+    for name, method, path, body, auth in SCENARIOS:
+        if method != 'GET' or (routes and name not in routes):
+            continue
+        url = path(0, ids) if callable(path) else path
+        response = client.get(url, headers=headers if auth else {}) # No Accept-Encoding: identity body
+        data = response.get_data()
+        response.close()
+        if response.status_code == 200:
+            bodies.append((name, response.mimetype, data))
+    return bodies
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode time and bytes on the wire for each GET route")
+    parser.add_argument('--routes', nargs='+', help="Only these benchmark.py scenario names")
+    args = parser.parse_args()
+
+    providers = [('json', DefaultJSONProvider(app))]
+    if orjson is not None:
+        providers.append(('orjson', OrjsonProvider(app)))
+    else:
+        print("orjson is not installed: only the stdlib encoder is measured (pip install orjson)")
+    encodings = response_compressor.available_encodings()
+    # What the app itself serves with, so a missing optional package can't go unnoticed
+    print(f"app JSON provider: {type(app.json).__name__}; "
+          f"brotli module: {brotli.__name__ if brotli is not None else 'not installed (gzip only)'}")
+
+    header = f"{'route':<22}{'identity':>10}" + ''.join(f"{e:>10}" for e in encodings)
+    header += ''.join(f"{name + ' ms':>11}" for name, _ in providers) + ''.join(f"{e + ' ms':>10}" for e in encodings)
+    print(header)
+    for name, mimetype, data in fetch_bodies(args.routes):
+        compressed = {e: response_compressor.compress(data, e) for e in encodings}
+        row = f"{name:<22}{len(data):>10}" + ''.join(f"{len(compressed[e]):>10}" for e in encodings)
+        if mimetype == 'application/json':
+            obj = json.loads(data)
+            row += ''.join(f"{best_time(lambda: provider.dumps(obj)):>11.2f}" for _, provider in providers)
+        else:
+            row += ''.join(f"{'-':>11}" for _ in providers) # CSV/NDJSON exports are not built by the JSON provider
+        row += ''.join(f"{best_time(lambda: response_compressor.compress(data, e)):>10.2f}" for e in encodings)
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Ensure current directory is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from models import db, Service, ContactInquiry, NewsletterSubscriber
+from pagination import keyset_page
+from routes import (
+    INQUIRY_SUMMARY_COLUMNS, SERVICE_COLUMNS, SUBSCRIBER_COLUMNS,
+    serialize_inquiry_summary, serialize_service, serialize_subscriber,
+)
+
+# Compares the read-only list endpoints' row-tuple path with loading full ORM
+# instances, on the current database (seed it first with seed_data.py): CPU time, peak
+# traced memory, and that both produce byte-identical JSON.
+
+def inquiries_orm():
+    rows = ContactInquiry.query.order_by(ContactInquiry.created_at.desc()).all()
+    return [serialize_inquiry_summary(i) for i in rows]
+
+def inquiries_rows():
+    rows = db.session.query(*INQUIRY_SUMMARY_COLUMNS).order_by(ContactInquiry.created_at.desc()).all()
+    return [serialize_inquiry_summary(i) for i in rows]
+
+def inquiries_page_orm():
+    rows, cursor = keyset_page(ContactInquiry.query, ContactInquiry, limit=100)
+    return {'items': [serialize_inquiry_summary(i) for i in rows], 'next_cursor': cursor}
+
+def inquiries_page_rows():
+    rows, cursor = keyset_page(db.session.query(*INQUIRY_SUMMARY_COLUMNS), ContactInquiry, limit=100)
+    return {'items': [serialize_inquiry_summary(i) for i in rows], 'next_cursor': cursor}
+
+def services_orm():
+    return [serialize_service(s) for s in Service.query.all()]
+
+def services_rows():
+    return [serialize_service(s) for s in db.session.query(*SERVICE_COLUMNS).all()]
+
+def subscribers_orm():
+    rows = NewsletterSubscriber.query.order_by(NewsletterSubscriber.created_at.desc()).all()
+    return [serialize_subscriber(s) for s in rows]
+
+def subscribers_rows():
+    rows = db.session.query(*SUBSCRIBER_COLUMNS).order_by(NewsletterSubscriber.created_at.desc()).all()
+    return [serialize_subscriber(s) for s in rows]
+
+# (name, ORM instances path, row-tuple path)
+CASES = [
+    ('inquiries (full list)', inquiries_orm, inquiries_rows),
+    ('inquiries (page of 100)', inquiries_page_orm, inquiries_page_rows),
+    ('services', services_orm, services_rows),
+    ('subscribers', subscribers_orm, subscribers_rows),
+]
+
+def measure(build, repeat):
+    # Median CPU time of `repeat` runs, then peak traced memory of one more run.
+    # The session is cleared after each run, as it is at the end of a request.
+    times = []
+    for _ in range(repeat):
+        started = time.process_time()
+        app.json.dumps(build())
+        times.append(time.process_time() - started)
+        db.session.remove()
+    tracemalloc.start()
+    app.json.dumps(build())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.session.remove()
+    return sorted(times)[len(times) // 2] * 1000, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="ORM instances vs row tuples for the read-only list endpoints")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'list':<26}{'rows':>8}{'orm ms':>10}{'rows ms':>10}{'orm peak KB':>13}{'rows peak KB':>14}  identical")
+    with app.app_context():
+        for name, orm_path, rows_path in CASES:
+            identical = app.json.dumps(orm_path()) == app.json.dumps(rows_path())
+            db.session.remove()
+            count = len(rows_path()['items'] if 'page' in name else rows_path())
+            orm_ms, orm_peak = measure(orm_path, args.repeat)
+            rows_ms, rows_peak = measure(rows_path, args.repeat)
+            print(f"{name:<26}{count:>8}{orm_ms:>10.1f}{rows_ms:>10.1f}{orm_peak / 1024:>13.0f}{rows_peak / 1024:>14.0f}"
+                  f"  {'yes' if identical else 'NO'}")
+            ok = ok and identical
+    if not ok:
+        print("FAIL: the row-tuple path changed the JSON output")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
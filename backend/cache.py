@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL.
+
+    Also serves as the local stand-in for a shared backend, since both
+    expose get/set/delete_prefix.
+    """
+
+    def __init__(self, max_entries=256, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class RedisBackend:
+    """Shared backend so every gunicorn worker sees the same entries.
+
+    Entries are (body, mimetype) pairs, stored as a hash of raw bytes and
+    a string: nothing read back from Redis is ever unpickled or executed.
+    """
+
+    def __init__(self, url, namespace='cvisual:'):
+        import redis # Optional dependency, only needed when CACHE_REDIS_URL is set
+        self.client = redis.Redis.from_url(url)
+        self.namespace = namespace
+
+    def get(self, key):
+        body, mimetype = self.client.hmget(self.namespace + key, 'body', 'mimetype')
+        if body is None or mimetype is None:
+            return None
+        return body, mimetype.decode()
+
+    def set(self, key, value, ttl=60):
+        body, mimetype = value
+        pipe = self.client.pipeline()
+        pipe.hset(self.namespace + key, mapping={'body': body, 'mimetype': mimetype})
+        pipe.expire(self.namespace + key, ttl)
+        pipe.execute()
+
+    def delete_prefix(self, prefix):
+        keys = list(self.client.scan_iter(match=f"{self.namespace}{prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+class ResponseCache:
+    def __init__(self):
+        self.enabled = True
+        self.ttl = 60
+        self.local = LRUCache()
+        self.shared = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock() # Counters are shared by the threads of a gthread worker
+
+    def init_app(self, app):
+        self.enabled = app.config.setdefault('CACHE_ENABLED', os.getenv('CACHE_ENABLED', '1') != '0')
+        self.ttl = app.config.setdefault('CACHE_TTL', int(os.getenv('CACHE_TTL', 60)))
+        max_entries = app.config.setdefault('CACHE_MAX_ENTRIES', int(os.getenv('CACHE_MAX_ENTRIES', 256)))
+        self.local = LRUCache(max_entries=max_entries, ttl=self.ttl)
+
+        redis_url = app.config.setdefault('CACHE_REDIS_URL', os.getenv('CACHE_REDIS_URL'))
+        if redis_url:
+            self.shared = RedisBackend(redis_url)
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value, self.ttl)
+        if self.shared is not None:
+            self.shared.set(key, value, self.ttl)
+
+    def invalidate(self, resource):
+        with self._lock:
+            self.invalidations += 1
+        self.local.delete_prefix(f"{resource}:")
+        if self.shared is not None:
+            self.shared.delete_prefix(f"{resource}:")
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'backend': 'redis' if self.shared is not None else 'local',
+            'entries': len(self.local),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.local.evictions,
+            'invalidations': self.invalidations
+        }
+
+response_cache = ResponseCache()
+
+def cached(resource, version=None):
+    """Cache a GET handler's 200 responses, keyed by resource and full path.
+
+    `version` is an optional callable returning the resource's current
+    version; when given it is part of the key, so a write made through
+    another worker can never be served from this worker's copy.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not response_cache.enabled:
+                return view(*args, **kwargs)
+
+            key = f"{resource}:{version(resource) if version else ''}:{request.full_path}"
+            entry = response_cache.get(key)
+            if entry is not None:
+                body, mimetype = entry
+                response = make_response(body)
+                response.mimetype = mimetype
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response_cache.set(key, (response.get_data(), response.mimetype))
+            return response
+        return wrapper
+    return decorator
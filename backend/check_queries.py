@@ -0,0 +1,190 @@
+import os
+import sys
+
+# Run against a throwaway in-memory database, never the real one
+os.environ['DATABASE_URL'] = 'sqlite://'
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from app import app
+from models import db, Admin, Project, Service, ContactInquiry
+from cache import response_cache
+from seed_data import seed
+
+# Maximum SQL statements per request, for every route in the api blueprint.
+# Each route is checked at two data volumes: it must stay within budget at both,
+# and issue the same number of statements at both (no per-row queries). Write
+# requests change a value at each volume, so an unchanged row never skips its UPDATE.
+QUERY_BUDGETS = {
+    ('GET', '/api/health'): 1,
+    ('POST', '/api/auth/login'): 1,
+    ('GET', '/api/portfolio'): 4,
+    ('POST', '/api/portfolio'): 2,
+    ('GET', '/api/portfolio/<int:id>'): 4,
+    ('PUT', '/api/portfolio/<int:id>'): 3,
+    ('DELETE', '/api/portfolio/<int:id>'): 7,
+    ('POST', '/api/portfolio/<int:id>/images'): 3, # Project lookup, content version bump, the image insert
+    ('POST', '/api/uploads/signature'): 0,
+    ('POST', '/api/contact'): 2, # The inquiry and its notification job
+    ('GET', '/api/contact/queue'): 0,
+    ('GET', '/api/inquiries'): 1,
+    ('GET', '/api/inquiries/search'): 1,
+    ('GET', '/api/inquiries/export'): 1,
+    ('GET', '/api/inquiries/<int:id>'): 1,
+    ('PUT', '/api/inquiries/<int:id>'): 2,
+    ('GET', '/api/dashboard/stats'): 4,
+    ('GET', '/api/cache/stats'): 0,
+    ('GET', '/api/db/pool'): 0,
+    ('GET', '/api/services'): 2,
+    ('POST', '/api/services'): 3,
+    ('PUT', '/api/services/<int:id>'): 3,
+    ('DELETE', '/api/services/<int:id>'): 3,
+    ('POST', '/api/newsletter'): 1,
+    ('GET', '/api/newsletter'): 1,
+    ('POST', '/api/newsletter/import'): 1,
+    ('GET', '/api/newsletter/export'): 1,
+}
+
+# (volume name, seed_data.seed arguments); the second phase adds to the first
+VOLUMES = [
+    ('small', {'projects': 3, 'images': 3, 'metrics': 2, 'inquiries': 5, 'subscribers': 5, 'seed': 1}),
+    ('large', {'projects': 40, 'images': 3, 'metrics': 2, 'inquiries': 200, 'subscribers': 200, 'seed': 2}),
+]
+
+# Anything else means the request failed early and its statement count proves nothing
+EXPECTED_STATUS = range(200, 300)
+CLOUD_NAME = 'budget-check'
+
+def first_id(model):
+    return db.session.query(model.id).order_by(model.id).limit(1).scalar()
+
+def new_service_id():
+    service = Service(name="Budget check")
+    db.session.add(service)
+    db.session.commit()
+    return service.id
+
+def build_requests(phase):
+    """(method, rule) -> (url, client.open kwargs) for the current data."""
+    project_id = first_id(Project)
+    # The project deleted below is the last one, so project_id stays valid for the other routes
+    last_project_id = db.session.query(Project.id).order_by(Project.id.desc()).limit(1).scalar()
+    inquiry_id, inquiry_status = db.session.query(ContactInquiry.id, ContactInquiry.status).order_by(ContactInquiry.id).first()
+    service_id = first_id(Service)
+    contact = {
+        'firstName': 'Budget', 'lastName': 'Check', 'email': f'budget-{phase}@example.com',
+        'phone': '+509 3000 0000', 'message': 'Vérification du budget de requêtes',
+    }
+    return {
+        ('GET', '/api/health'): ('/api/health', {}),
+        ('POST', '/api/auth/login'): ('/api/auth/login', {'json': {'username': 'budget', 'password': 'budget'}}),
+        ('GET', '/api/portfolio'): ('/api/portfolio', {}),
+        ('GET', '/api/portfolio/<int:id>'): (f'/api/portfolio/{project_id}', {}),
+        ('POST', '/api/portfolio'): ('/api/portfolio', {'data': {'title': f'Budget {phase}', 'category': 'Site Web'}}),
+        ('PUT', '/api/portfolio/<int:id>'): (f'/api/portfolio/{project_id}', {'data': {'title': f'Budget {phase}'}}),
+        ('DELETE', '/api/portfolio/<int:id>'): (f'/api/portfolio/{last_project_id}', {}),
+        ('POST', '/api/portfolio/<int:id>/images'): (f'/api/portfolio/{project_id}/images', {'json': {'urls': [
+            f'https://res.cloudinary.com/{CLOUD_NAME}/image/upload/v1/cvisual/portfolio/budget-{phase}.jpg'
+        ]}}),
+        ('POST', '/api/uploads/signature'): ('/api/uploads/signature', {'json': {}}),
+        ('POST', '/api/contact'): ('/api/contact', {'json': contact}),
+        ('GET', '/api/contact/queue'): ('/api/contact/queue', {}),
+        ('GET', '/api/inquiries'): ('/api/inquiries?limit=50', {}),
+        ('GET', '/api/inquiries/search'): ('/api/inquiries/search?q=refonte&limit=50', {}),
+        ('GET', '/api/inquiries/export'): ('/api/inquiries/export', {}),
+        ('GET', '/api/inquiries/<int:id>'): (f'/api/inquiries/{inquiry_id}', {}),
+        ('PUT', '/api/inquiries/<int:id>'): (f'/api/inquiries/{inquiry_id}', {'json': {'status': 'closed' if inquiry_status != 'closed' else 'pending'}}),
+        ('GET', '/api/dashboard/stats'): ('/api/dashboard/stats', {}),
+        ('GET', '/api/cache/stats'): ('/api/cache/stats', {}),
+        ('GET', '/api/db/pool'): ('/api/db/pool', {}),
+        ('GET', '/api/services'): ('/api/services', {}),
+        ('POST', '/api/services'): ('/api/services', {'json': {'name': f'Budget {phase}'}}),
+        ('PUT', '/api/services/<int:id>'): (f'/api/services/{service_id}', {'json': {'roi': f'+{phase}%'}}),
+        ('DELETE', '/api/services/<int:id>'): (f'/api/services/{new_service_id()}', {}),
+        ('POST', '/api/newsletter'): ('/api/newsletter', {'json': {'email': f'budget-{phase}@example.com'}}),
+        ('GET', '/api/newsletter'): ('/api/newsletter', {}),
+        ('POST', '/api/newsletter/import'): ('/api/newsletter/import', {'json': {'emails': [f'import-{phase}-{n}@example.com' for n in range(20)]}}),
+        ('GET', '/api/newsletter/export'): ('/api/newsletter/export', {}),
+    }
+
+def capture_statements(engine, client, method, url, headers, kwargs):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.open(url, method=method, headers=headers, **kwargs)
+        response.get_data() # Drain streamed responses so their queries run too
+        response.close()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return response.status_code, statements
+
+def api_routes():
+    return sorted(
+        (method, rule.rule)
+        for rule in app.url_map.iter_rules() if rule.endpoint.startswith('api.')
+        for method in rule.methods - {'HEAD', 'OPTIONS'}
+    )
+
+def check_query_budgets():
+    response_cache.enabled = False # Every request must reach the database
+    app.config['CLOUDINARY_URL'] = f'cloudinary://key:secret@{CLOUD_NAME}' # Signing is local, nothing is uploaded
+    ok = True
+
+    routes = api_routes()
+    missing = [route for route in routes if route not in QUERY_BUDGETS]
+    for method, rule in missing:
+        print(f"FAIL: {method} {rule} has no entry in QUERY_BUDGETS")
+        ok = False
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add(Admin(username='budget', password_hash=generate_password_hash('budget')))
+        db.session.commit()
+        headers = {'Authorization': f"Bearer {create_access_token(identity='budget')}"}
+        engine = db.engine
+    client = app.test_client()
+
+    counts = {}
+    for volume, volume_args in VOLUMES:
+        seed(**volume_args)
+        with app.app_context():
+            requests = build_requests(volume)
+        for route in routes:
+            if route not in requests:
+                continue
+            method, _ = route
+            url, kwargs = requests[route]
+            status, statements = capture_statements(engine, client, method, url, headers, kwargs)
+            if status not in EXPECTED_STATUS:
+                print(f"FAIL: {method} {url} returned {status} with {volume} data")
+                ok = False
+            counts.setdefault(route, []).append((volume, statements))
+
+    print(f"\n{'route':<45}" + ''.join(f"{volume:>8}" for volume, _ in VOLUMES) + f"{'budget':>8}")
+    for route, results in counts.items():
+        method, rule = route
+        budget = QUERY_BUDGETS.get(route)
+        sizes = [len(statements) for _, statements in results]
+        over = budget is not None and max(sizes) > budget
+        grows = len(set(sizes)) > 1
+        flag = '  OVER BUDGET' if over else '  GROWS WITH DATA' if grows else ''
+        print(f"{method + ' ' + rule:<45}" + ''.join(f"{size:>8}" for size in sizes) + f"{budget if budget is not None else '-':>8}{flag}")
+        if over or grows:
+            ok = False
+            volume, statements = results[-1]
+            print(f"  statements with {volume} data:")
+            for statement in statements:
+                print(f"    {' '.join(statement.split())}")
+
+    print("\nOK: every route is within its query budget" if ok else "\nFAIL: query budget check failed")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check_query_budgets() else 1)
@@ -0,0 +1,53 @@
+import os
+import sys
+import tempfile
+import threading
+
+# Concurrency needs real connections, so use a throwaway SQLite file rather than :memory:
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'check_subscribe.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from models import db, NewsletterSubscriber
+
+THREADS = 16
+ROUNDS = 5
+
+def check_concurrent_subscribe():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+    statuses = []
+    barrier = threading.Barrier(THREADS)
+
+    def worker(n):
+        client = app.test_client()
+        for round in range(ROUNDS):
+            # Every thread hits the same address at the same moment, in varying case
+            email = f"Campaign{round}@Example.com" if n % 2 else f"  campaign{round}@example.COM "
+            barrier.wait()
+            response = client.post('/api/newsletter', json={'email': email})
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with app.app_context():
+        stored = sorted(email for (email,) in db.session.query(NewsletterSubscriber.email))
+
+    print(f"POST /api/newsletter x{len(statuses)}: "
+          f"{statuses.count(201)} created, {statuses.count(200)} already subscribed, "
+          f"{len(statuses) - statuses.count(201) - statuses.count(200)} errors")
+    expected = [f"campaign{round}@example.com" for round in range(ROUNDS)]
+    ok = statuses.count(201) == ROUNDS and statuses.count(200) == len(statuses) - ROUNDS and stored == expected
+    if not ok:
+        print(f"FAIL: expected exactly one subscriber per address, got {stored}")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if check_concurrent_subscribe() else 1)
@@ -0,0 +1,116 @@
+import gzip
+import os
+import zlib
+from flask import request
+from cache import LRUCache
+
+try:
+    import brotli # In requirements.txt (brotlicffi also works); without it only gzip is offered
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/csv', 'application/x-ndjson')
+
+class ResponseCompressor:
+    """Negotiated gzip/brotli for JSON, CSV and NDJSON responses.
+
+    Bodies under COMPRESS_MIN_SIZE go out as-is (the headers would cost more
+    than the saving). Streamed exports are compressed chunk by chunk, so they
+    keep streaming. Brotli is preferred when the client accepts it and a
+    brotli module is installed; otherwise gzip. COMPRESS_ENABLED=0 turns it
+    off, e.g. behind a proxy that already compresses.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 6
+        # Cached GET responses are served again and again: keep their compressed bodies, keyed by ETag
+        self._encoded = LRUCache(max_entries=128, ttl=300)
+
+    def init_app(self, app):
+        self.enabled = app.config.setdefault('COMPRESS_ENABLED', os.getenv('COMPRESS_ENABLED', '1') == '1')
+        self.min_size = app.config.setdefault('COMPRESS_MIN_SIZE', int(os.getenv('COMPRESS_MIN_SIZE', 1024)))
+        self.gzip_level = app.config.setdefault('COMPRESS_GZIP_LEVEL', int(os.getenv('COMPRESS_GZIP_LEVEL', 6)))
+        self.brotli_quality = app.config.setdefault('COMPRESS_BROTLI_QUALITY', int(os.getenv('COMPRESS_BROTLI_QUALITY', 6)))
+        if self.enabled:
+            app.after_request(self._compress_response)
+
+    def available_encodings(self):
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self, accept_encoding):
+        # Best encoding the client accepts (q > 0), in server preference order
+        for encoding in self.available_encodings():
+            if accept_encoding[encoding] > 0:
+                return encoding
+        return None
+
+    # --- ENCODERS ---
+    def compress(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_stream(self, chunks, encoding, source):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            compress, finish = compressor.process, compressor.finish
+            flush = compressor.flush
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            compress, finish = compressor.compress, compressor.flush
+            flush = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+        try:
+            for chunk in chunks:
+                # Flush per chunk: exports yield a thousand rows at a time, so the client keeps receiving data
+                data = compress(chunk) + flush()
+                if data:
+                    yield data
+            yield finish()
+        finally:
+            # Closes the export's database cursor if the client goes away mid-stream
+            if hasattr(source, 'close'):
+                source.close()
+
+    # --- REQUEST HOOK ---
+    def _compress_response(self, response):
+        if (request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            source = response.response
+            response.response = self.compress_stream(response.iter_encoded(), encoding, source)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            etag = response.headers.get('ETag')
+            key = f"{encoding}:{etag}" if etag else None
+            body = self._encoded.get(key) if key else None
+            if body is None:
+                body = self.compress(data, encoding)
+                if key:
+                    self._encoded.set(key, body)
+            response.set_data(body)
+
+        response.headers['Content-Encoding'] = encoding
+        # Each encoding is a different byte sequence, so the tag becomes weak (If-None-Match compares weakly)
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+response_compressor = ResponseCompressor()
@@ -0,0 +1,198 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from models import db, ContactInquiry
+from jobs import enqueue_inquiry_notification
+
+# Far above DB_STATEMENT_TIMEOUT_MS, so a live flusher's claim never expires under it
+CLAIM_TIMEOUT = 300
+
+class WriteBehindQueue:
+    """Durable local journal for contact submissions, flushed in batches.
+
+    Delivery guarantee: at-least-once. A submission is acknowledged only after
+    its journal row is committed (synchronous=FULL), and is deleted from the
+    journal only after the batch carrying it has committed to the main
+    database. A crash between those two commits re-delivers that one batch on
+    restart; nothing acknowledged is ever lost. Every worker process runs its
+    own flusher on the shared journal file. A flusher claims a batch in a
+    short journal transaction, writes it to the main database with the
+    journal unlocked (so enqueue() never waits on Postgres), then deletes
+    it. A claim left by a worker that died mid-flush expires after
+    CLAIM_TIMEOUT seconds and the batch is delivered again.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.enabled = False
+        self.path = None
+        self.batch_size = 500
+        self.flush_interval = 1.0
+        self._local = threading.local()
+        self._started_pid = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._enqueued = 0 # Since the last flush, by this process
+        self.sampled_depth = 0 # Journal rows across all workers, counted by the flusher
+        self.flushed = 0
+        self.flush_count = 0
+        self.flush_failures = 0
+        self.last_flush_ms = None
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.setdefault('CONTACT_WRITE_BEHIND', os.getenv('CONTACT_WRITE_BEHIND', '0') == '1')
+        self.path = app.config.setdefault(
+            'CONTACT_QUEUE_PATH',
+            os.getenv('CONTACT_QUEUE_PATH', os.path.join(app.instance_path, 'contact_queue.db'))
+        )
+        self.batch_size = app.config.setdefault('CONTACT_QUEUE_BATCH_SIZE', int(os.getenv('CONTACT_QUEUE_BATCH_SIZE', 500)))
+        self.flush_interval = app.config.setdefault('CONTACT_QUEUE_FLUSH_INTERVAL', float(os.getenv('CONTACT_QUEUE_FLUSH_INTERVAL', 1.0)))
+        if self.enabled:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = self._connection()
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS journal ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, created_at TEXT NOT NULL, '
+                'claimed_by TEXT, claimed_at REAL)'
+            )
+            # Journals written before claims existed
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(journal)')}
+            if 'claimed_by' not in columns:
+                conn.execute('ALTER TABLE journal ADD COLUMN claimed_by TEXT')
+                conn.execute('ALTER TABLE journal ADD COLUMN claimed_at REAL')
+            # The flusher itself is started per worker, at boot (gunicorn.conf.py post_worker_init)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=FULL')
+            self._local.conn = conn
+        return conn
+
+    def start(self):
+        # Once per process: a flusher thread never survives a fork
+        if not self.enabled or self._started_pid == os.getpid():
+            return
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._local = threading.local() # Never reuse a connection inherited across fork
+            threading.Thread(target=self._run, name='contact-queue-flusher', daemon=True).start()
+            self._started_pid = os.getpid()
+
+    def enqueue(self, fields):
+        self.start() # Already running under gunicorn; starts it on the dev server
+        self._connection().execute(
+            'INSERT INTO journal (payload, created_at) VALUES (?, ?)',
+            (json.dumps(fields), datetime.utcnow().isoformat())
+        )
+        with self._lock:
+            self._enqueued += 1
+            full = self._enqueued >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def depth(self):
+        return self._connection().execute('SELECT COUNT(*) FROM journal').fetchone()[0]
+
+    def _claim(self, conn):
+        # Short write transaction: the journal lock is held only while marking the batch
+        token = f"{os.getpid()}:{threading.get_ident()}"
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                'SELECT id, payload, created_at FROM journal '
+                'WHERE claimed_by IS NULL OR claimed_at < ? ORDER BY id LIMIT ?',
+                (now - CLAIM_TIMEOUT, self.batch_size)
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    'UPDATE journal SET claimed_by = ?, claimed_at = ? WHERE id = ?',
+                    [(token, now, row[0]) for row in rows]
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return rows
+
+    def _release(self, conn, ids, delete):
+        placeholders = ','.join('?' * len(ids))
+        if delete:
+            conn.execute(f'DELETE FROM journal WHERE id IN ({placeholders})', ids)
+        else:
+            conn.execute(f'UPDATE journal SET claimed_by = NULL, claimed_at = NULL WHERE id IN ({placeholders})', ids)
+
+    def flush(self):
+        """Move up to one batch from the journal into the main database."""
+        conn = self._connection()
+        rows = self._claim(conn)
+        if not rows:
+            return 0
+        ids = [row[0] for row in rows]
+
+        started = time.perf_counter()
+        try:
+            with self.app.app_context():
+                inquiries = [
+                    {**json.loads(payload), 'status': 'pending', 'created_at': datetime.fromisoformat(created_at)}
+                    for _, payload, created_at in rows
+                ]
+                db.session.execute(ContactInquiry.__table__.insert().values(inquiries))
+                for fields in inquiries:
+                    enqueue_inquiry_notification(fields)
+                db.session.commit()
+        except Exception:
+            # Hand the batch back so the next attempt (from any worker) retries it now, not after the claim expires
+            self._release(conn, ids, delete=False)
+            raise
+        self._release(conn, ids, delete=True)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushed += len(rows)
+        self.flush_count += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self.total_flush_ms += elapsed_ms
+        return len(rows)
+
+    def _run(self):
+        backoff = self.flush_interval
+        while True:
+            self._wake.wait(backoff)
+            self._wake.clear()
+            with self._lock:
+                self._enqueued = 0
+            try:
+                # Drain full batches back to back, then go back to sleep
+                while self.flush() == self.batch_size:
+                    pass
+                backoff = self.flush_interval
+                self.sampled_depth = self.depth()
+            except Exception as e:
+                self.flush_failures += 1
+                backoff = min(backoff * 2, 60)
+                print(f"Contact queue flush failed, retrying in {backoff:.0f}s: {e}")
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'depth': self.sampled_depth,
+            'flushed': self.flushed,
+            'flushes': self.flush_count,
+            'flush_failures': self.flush_failures,
+            'last_flush_ms': self.last_flush_ms,
+            'avg_flush_ms': self.total_flush_ms / self.flush_count if self.flush_count else None,
+            'max_flush_ms': self.max_flush_ms
+        }
+
+contact_queue = WriteBehindQueue()
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+def env_flag(name, default):
+    return os.getenv(name, '1' if default else '0').lower() in ('1', 'true', 'yes')
+
+def engine_options(database_url):
+    """SQLALCHEMY_ENGINE_OPTIONS built from DB_* environment variables.
+
+    Pool sizing only applies to server databases; SQLite keeps
+    Flask-SQLAlchemy's defaults.
+    """
+    if not database_url or database_url.startswith('sqlite'):
+        return {}
+
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        # Managed Postgres drops idle connections; recycle before that and ping on checkout
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 280)),
+        'pool_pre_ping': env_flag('DB_POOL_PRE_PING', True),
+    }
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if statement_timeout and database_url.startswith('postgresql'):
+        options['connect_args'] = {'options': f"-c statement_timeout={statement_timeout}"}
+    return options
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool = None
+        self.counters = {
+            'connects': 0,
+            'checkouts': 0,
+            'checkins': 0,
+            'invalidations': 0,
+            'soft_invalidations': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_max = 0
+
+    def incr(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def record_wait(self, seconds, timed_out=False):
+        with self._lock:
+            self.counters['waits'] += 1
+            if timed_out:
+                self.counters['timeouts'] += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def attach(self, engine):
+        self.pool = engine.pool
+        event.listen(engine, 'connect', lambda *args: self.incr('connects'))
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', lambda *args: self.incr('checkins'))
+        event.listen(engine, 'invalidate', lambda *args: self.incr('invalidations'))
+        event.listen(engine, 'soft_invalidate', lambda *args: self.incr('soft_invalidations'))
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.incr('checkouts')
+        if isinstance(self.pool, QueuePool):
+            self.overflow_max = max(self.overflow_max, self.pool.overflow())
+
+    def stats(self):
+        pool = self.pool
+        snapshot = {
+            'pid': os.getpid(),
+            'pool_class': type(pool).__name__ if pool else None,
+            **self.counters,
+            'wait_seconds_total': round(self.wait_seconds_total, 6),
+            'wait_seconds_max': round(self.wait_seconds_max, 6),
+            'overflow_max': self.overflow_max,
+        }
+        if isinstance(pool, QueuePool):
+            snapshot.update({
+                'size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': pool.overflow(),
+            })
+        return snapshot
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long requests wait once the pool is exhausted."""
+
+    def _do_get(self):
+        # Only checkouts beyond size + overflow actually block
+        exhausted = self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+        if not exhausted:
+            return super()._do_get()
+
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+def warm_pool(engine, connections):
+    """Open up to `connections` pooled connections so early requests don't pay for connecting.
+
+    They are all checked out at once (a single connection would just be
+    reused) and returned to the pool. Once the pool already holds that many
+    idle connections only one is pinged. Returns how many were checked out.
+    """
+    pool = engine.pool
+    wanted = 1
+    if isinstance(pool, QueuePool):
+        wanted = max(1, min(connections, pool.size()))
+        if pool.checkedin() >= wanted:
+            wanted = 1
+
+    held = []
+    try:
+        for _ in range(wanted):
+            conn = engine.connect()
+            held.append(conn)
+            conn.exec_driver_sql('SELECT 1')
+    finally:
+        for conn in held:
+            conn.close()
+    return len(held)
@@ -0,0 +1,64 @@
+import os
+import sys
+
+# Ensure current directory is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import app
+from models import db
+from cache import response_cache
+
+# Read-only endpoints whose queries should be served by indexes
+ENDPOINTS = [
+    '/api/portfolio',
+    '/api/portfolio?category=Site%20Web&industry=ecommerce&limit=20',
+    '/api/services',
+    '/api/inquiries?limit=50',
+    '/api/inquiries?status=pending&limit=50',
+    '/api/inquiries?from=2025-01-01&to=2025-12-31&limit=50',
+    '/api/dashboard/stats',
+    '/api/newsletter',
+    '/api/newsletter/export',
+    '/api/inquiries/export?status=pending',
+]
+
+def capture_statements(client, url, headers):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url, headers=headers)
+        response.get_data() # Drain streamed responses so their queries run too
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return response.status_code, statements
+
+def explain(statement, parameters):
+    prefix = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+    # SQLite returns (id, parent, notused, detail); Postgres returns one text column
+    return [row[-1] for row in rows]
+
+def explain_endpoints():
+    response_cache.enabled = False # Every request must reach the database
+    with app.app_context():
+        print(f"Database: {db.engine.dialect.name}")
+        headers = {'Authorization': f"Bearer {create_access_token(identity='explain')}"}
+        client = app.test_client()
+
+        for url in ENDPOINTS:
+            status, statements = capture_statements(client, url, headers)
+            print(f"\n=== GET {url} ({status}, {len(statements)} queries)")
+            for statement, parameters in statements:
+                print(f"\n{' '.join(statement.split())}")
+                for line in explain(statement, parameters):
+                    print(f"    {line}")
+
+if __name__ == "__main__":
+    explain_endpoints()
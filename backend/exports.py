@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+from models import db
+
+EXPORT_CHUNK_SIZE = 1000
+
+def stream_rows(statement, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield lists of rows, fetching `chunk_size` at a time.
+
+    stream_results asks the driver for a server-side cursor (a named cursor on
+    psycopg2), so memory stays flat no matter how large the table is.
+    """
+    result = db.session.execute(
+        statement.execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    try:
+        for chunk in result.partitions():
+            yield chunk
+    finally:
+        result.close()
+
+def csv_stream(header, chunks, to_row):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(to_row(row) for row in chunk)
+        yield buffer.getvalue()
+
+def ndjson_stream(chunks, to_dict):
+    for chunk in chunks:
+        yield ''.join(json.dumps(to_dict(row), ensure_ascii=False) + '\n' for row in chunk)
@@ -0,0 +1,91 @@
+import os
+
+if os.getenv('GUNICORN_PROFILE', 'gthread') == 'gevent':
+    # Patch before the app is preloaded: its locks, the connection pool's Condition and
+    # its queue would otherwise be real OS primitives, and a greenlet waiting on one would
+    # block the whole worker. Gunicorn's own patching only happens after post_fork.
+    from gevent import monkey
+    monkey.patch_all()
+
+import multiprocessing
+
+# Worker profile: "gthread" (default), "gevent" (needs gevent, and psycogreen for Postgres) or "sync"
+profile = os.getenv('GUNICORN_PROFILE', 'gthread')
+cpus = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.getenv('PORT') or '10000'}"
+
+if profile == 'gevent':
+    worker_class = 'gevent'
+    workers = int(os.getenv('WEB_CONCURRENCY') or cpus)
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS') or 100)
+elif profile == 'sync':
+    worker_class = 'sync'
+    workers = int(os.getenv('WEB_CONCURRENCY') or cpus * 2 + 1)
+else:
+    # Threads let a slow upload or query block one thread instead of the whole worker.
+    # Keep DB_POOL_SIZE + DB_MAX_OVERFLOW >= threads so requests never queue on the pool.
+    worker_class = 'gthread'
+    workers = int(os.getenv('WEB_CONCURRENCY') or min(cpus * 2 + 1, 4))
+    threads = int(os.getenv('GUNICORN_THREADS') or 4)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT') or 60)
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT') or 30)
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE') or 5)
+
+# Recycle workers gradually to bound memory growth; jitter avoids restarting them all at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS') or 1000)
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER') or 100)
+
+# Load the app once in the master so workers fork with it already imported
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+# Render terminates TLS in front of us
+forwarded_allow_ips = '*'
+accesslog = '-'
+errorlog = '-'
+
+# Workers share request metrics through snapshot files (see metrics.py); an empty METRICS_DIR= counts as unset
+if not os.getenv('METRICS_DIR'):
+    os.environ['METRICS_DIR'] = f"/tmp/cvisual-metrics-{os.getenv('PORT') or '10000'}"
+
+def on_starting(server):
+    # Counters from a previous run of the server must not be summed into this one
+    metrics_dir = os.environ['METRICS_DIR']
+    if os.path.isdir(metrics_dir):
+        for filename in os.listdir(metrics_dir):
+            if filename.endswith('.json') or filename.endswith('.tmp'):
+                os.remove(os.path.join(metrics_dir, filename))
+
+def post_fork(server, worker):
+    if profile == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning("psycogreen not installed: Postgres calls will block the gevent loop")
+
+    # Pooled connections opened in the master must never be shared with a child
+    from app import app
+    from models import db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def post_worker_init(worker):
+    # Start the write-behind flusher at boot, so a journal left by a crash drains before any traffic
+    from contact_queue import contact_queue
+    contact_queue.start()
+
+def worker_exit(server, worker):
+    # Keep this worker's final counts for /metrics once it is gone
+    from metrics import request_metrics
+    if request_metrics.directory:
+        request_metrics.flush()
+
+def child_exit(server, worker):
+    # Runs in the master once the worker is gone (also after a timeout kill, when worker_exit
+    # never ran): fold its last snapshot into the exited total so per-pid files don't pile up
+    from metrics import fold_snapshot
+    metrics_dir = os.environ['METRICS_DIR']
+    if os.path.isdir(metrics_dir):
+        fold_snapshot(metrics_dir, worker.pid)
@@ -0,0 +1,152 @@
+import io
+import json
+import random
+import smtplib
+import traceback
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from flask import current_app
+from models import db, Job, Project, ProjectImage, SpooledFile
+
+HANDLERS = {}
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 3600
+# A job still "running" after this long belongs to a worker that died
+STALE_LOCK_SECONDS = 600
+
+def job(kind):
+    def decorator(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+def enqueue(kind, payload, max_attempts=5, run_at=None):
+    """Add a job to the current session; it becomes visible when the caller commits.
+
+    Enqueuing in the same transaction as the data it refers to means a job
+    is never lost, and never runs for a write that rolled back.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    new_job = Job(kind=kind, payload=json.dumps(payload), max_attempts=max_attempts,
+                  run_at=run_at or datetime.utcnow())
+    db.session.add(new_job)
+    return new_job
+
+def enqueue_inquiry_notification(fields):
+    # Always enqueued: the recipient (ADMIN_NOTIFY_EMAIL) is the worker's setting, not the web process's.
+    # fields are the ContactInquiry columns
+    enqueue('notify_new_inquiry', {k: v for k, v in fields.items() if k != 'created_at'})
+
+def spool_gallery_upload(project_id, file):
+    # Keeps the upload in the database so the worker, wherever it runs, can send it to Cloudinary later
+    spooled = SpooledFile(filename=file.filename, data=file.read())
+    db.session.add(spooled)
+    db.session.flush()
+    enqueue('upload_gallery_image', {'project_id': project_id, 'file_id': spooled.id})
+
+def retry_delay(attempts):
+    # Exponential backoff with jitter so failing jobs don't retry in lockstep
+    delay = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+def requeue_stale():
+    # A stale job counts as a failed attempt: one that keeps crashing its worker ends up dead, not retried forever
+    stale = Job.query.filter(Job.status == 'running', Job.locked_at < datetime.utcnow() - timedelta(seconds=STALE_LOCK_SECONDS))
+    update = {'attempts': Job.attempts + 1, 'locked_at': None, 'last_error': 'Worker stopped while running this job'}
+    dead = stale.filter(Job.attempts + 1 >= Job.max_attempts).update(
+        {**update, 'status': 'dead'}, synchronize_session=False
+    )
+    count = stale.update({**update, 'status': 'queued'}, synchronize_session=False)
+    db.session.commit()
+    if dead:
+        print(f"{dead} stale job(s) out of attempts, marked dead")
+    return count
+
+def claim_next():
+    """Atomically move the next due job from queued to running, or return None."""
+    now = datetime.utcnow()
+    candidates = db.session.query(Job.id).filter(
+        Job.status == 'queued', Job.run_at <= now
+    ).order_by(Job.run_at, Job.id).limit(5).all()
+    for (job_id,) in candidates:
+        # Compare-and-set: only one worker can win the status transition
+        claimed = Job.query.filter(Job.id == job_id, Job.status == 'queued').update(
+            {'status': 'running', 'locked_at': now}, synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+    return None
+
+def run_job(claimed):
+    handler = HANDLERS.get(claimed.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for {claimed.kind}")
+        handler(json.loads(claimed.payload))
+    except Exception as e:
+        db.session.rollback()
+        claimed.attempts += 1
+        claimed.last_error = f"{e}\n{traceback.format_exc()}"
+        claimed.locked_at = None
+        if claimed.attempts >= claimed.max_attempts or handler is None:
+            claimed.status = 'dead' # Dead letter: kept for inspection, never retried automatically
+        else:
+            claimed.status = 'queued'
+            claimed.run_at = datetime.utcnow() + retry_delay(claimed.attempts)
+        db.session.commit()
+        return False
+
+    claimed.status = 'done'
+    claimed.attempts += 1
+    claimed.locked_at = None
+    db.session.commit()
+    return True
+
+# --- JOB HANDLERS ---
+@job('notify_new_inquiry')
+def notify_new_inquiry(inquiry):
+    config = current_app.config
+    recipient = config.get('ADMIN_NOTIFY_EMAIL')
+    if not recipient:
+        return
+
+    message = EmailMessage()
+    message['Subject'] = f"Nouvelle demande de {inquiry.get('first_name')} {inquiry.get('last_name')}"
+    message['From'] = config.get('SMTP_FROM') or recipient
+    message['To'] = recipient
+    message['Reply-To'] = inquiry.get('email') or recipient
+    message.set_content('\n'.join([
+        f"Nom: {inquiry.get('first_name')} {inquiry.get('last_name')}",
+        f"Email: {inquiry.get('email')}",
+        f"Téléphone: {inquiry.get('phone')}",
+        f"Entreprise: {inquiry.get('company') or 'N/A'}",
+        f"Service: {inquiry.get('service_type') or 'N/A'}",
+        f"Budget: {inquiry.get('budget') or 'Non spécifié'}",
+        f"Délai: {inquiry.get('timeline') or 'Flexible'}",
+        '',
+        inquiry.get('message') or '',
+    ]))
+
+    with smtplib.SMTP(config.get('SMTP_HOST', 'localhost'), int(config.get('SMTP_PORT', 25)), timeout=30) as smtp:
+        if config.get('SMTP_STARTTLS'):
+            smtp.starttls()
+        if config.get('SMTP_USERNAME'):
+            smtp.login(config['SMTP_USERNAME'], config.get('SMTP_PASSWORD', ''))
+        smtp.send_message(message)
+
+@job('upload_gallery_image')
+def upload_gallery_image(payload):
+    # Spooled by add_project when DEFER_GALLERY_UPLOADS is on
+    from uploads import get_uploader
+    spooled = db.session.get(SpooledFile, payload['file_id'])
+    if spooled is None:
+        return # Already uploaded by an earlier attempt that committed
+    if db.session.get(Project, payload['project_id']) is not None: # Else the project was deleted before the upload ran
+        file = io.BytesIO(spooled.data)
+        file.name = spooled.filename or 'upload'
+        url = get_uploader()(file, f"cvisual/portfolio/{payload['project_id']}")
+        db.session.add(ProjectImage(project_id=payload['project_id'], image_url=url))
+    db.session.delete(spooled)
+    db.session.commit()
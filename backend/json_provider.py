@@ -0,0 +1,57 @@
+import os
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson # In requirements.txt; without it JSON_PROVIDER=auto falls back to the stdlib
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify/get_json backed by orjson, several times faster on large lists.
+
+    Output is the same JSON as the default provider (sorted keys, compact),
+    except that non-ASCII text is sent as UTF-8 rather than \\u escapes.
+    Dates and any other type orjson doesn't handle natively go through the
+    default provider's converter, so they serialize exactly as before.
+    """
+
+    def dumps(self, obj, **kwargs):
+        # sort_keys, indent=2 and default map onto orjson; any other json.dumps
+        # option (separators, ensure_ascii, cls...) goes to the stdlib provider
+        if set(kwargs) - {'sort_keys', 'indent', 'default'} or kwargs.get('indent') not in (None, 2):
+            return super().dumps(obj, **kwargs)
+        return self._dumps(
+            obj, sort_keys=kwargs.get('sort_keys', self.sort_keys),
+            indent=kwargs.get('indent') is not None, default=kwargs.get('default', self.default),
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        # orjson already returns bytes: skip the str round trip the default provider does
+        return self._app.response_class(self._dumps(obj, indent=indent) + b"\n", mimetype=self.mimetype)
+
+    def _dumps(self, obj, sort_keys=None, indent=False, default=None):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default or self.default, option=option)
+
+JSON_PROVIDERS = {'default': DefaultJSONProvider, 'orjson': OrjsonProvider}
+
+def init_json_provider(app):
+    # JSON_PROVIDER=auto (default) uses orjson when it is installed
+    name = app.config.setdefault('JSON_PROVIDER', os.getenv('JSON_PROVIDER', 'auto'))
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'default'
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f"Unknown JSON_PROVIDER {name!r}, expected auto, {' or '.join(JSON_PROVIDERS)}")
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson but the orjson package is not installed")
+    app.json = JSON_PROVIDERS[name](app)
+    return name
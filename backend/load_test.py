@@ -0,0 +1,125 @@
+import argparse
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# Starts gunicorn once per worker profile (see gunicorn.conf.py) and drives the same
+# read-only endpoints with concurrent clients, so the profiles can be compared side by side.
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATHS = ['/api/portfolio', '/api/services', '/api/portfolio?limit=20']
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(base_url, process, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            urllib.request.urlopen(base_url + '/api/services', timeout=1).read()
+            return True
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    return False
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def drive(base_url, paths, concurrency, duration):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(n):
+        i = n
+        while time.perf_counter() < stop_at:
+            url = base_url + paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=30) as response:
+                    response.read()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / duration,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def run_profile(profile, args):
+    port = free_port()
+    env = {
+        **os.environ,
+        'GUNICORN_PROFILE': profile,
+        'PORT': str(port),
+        'CACHE_ENABLED': '1' if args.cache else '0',
+    }
+    if args.workers:
+        env['WEB_CONCURRENCY'] = str(args.workers)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_until_ready(base_url, process):
+            print(f"{profile}: gunicorn failed to start")
+            return None
+        drive(base_url, args.paths, args.concurrency, min(2, args.duration)) # Warm up pools and caches
+        return drive(base_url, args.paths, args.concurrency, args.duration)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gunicorn worker profiles under concurrent load")
+    parser.add_argument('--profiles', nargs='+', default=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, help="Override WEB_CONCURRENCY for every profile")
+    parser.add_argument('--cache', action='store_true', help="Keep the response cache on (off by default so requests reach the database)")
+    args = parser.parse_args()
+
+    print(f"Database: {os.getenv('DATABASE_URL', 'sqlite:///cvisual.db')}")
+    print(f"{args.concurrency} clients, {args.duration:.0f}s per profile, paths: {', '.join(args.paths)}\n")
+    print(f"{'profile':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for profile in args.profiles:
+        if profile == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print(f"{profile:<10}skipped (pip install gevent)")
+            continue
+        result = run_profile(profile, args)
+        if result:
+            print(f"{profile:<10}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.1f}"
+                  f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,14 @@ import sys
 # Ensure current directory is in path
 sys.path.append(os.getcwd())
 
-from app import app, db
+from app import app, db, init_migrate
 from sqlalchemy import inspect
 from flask_migrate import upgrade, stamp, current
 from init_db import init_db
 
 def setup_db():
     print("\n--- DATABASE SETUP START ---")
+    init_migrate(app)
     with app.app_context():
         try:
             # Use inspector to get all tables across all schemas (primarily public)
@@ -0,0 +1,319 @@
+import json
+import os
+import threading
+import time
+from flask import Response, request, has_request_context
+from sqlalchemy import event
+from db_pool import pool_metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+SQL_COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128)
+
+# Pool counters are summed across processes; the rest are per-process gauges
+POOL_COUNTERS = ('connects', 'checkouts', 'invalidations', 'waits', 'timeouts')
+POOL_GAUGES = ('checked_out', 'checked_in', 'overflow')
+
+ENVIRON_KEY = 'cvisual.metrics'
+# Counts of gunicorn workers that have exited, folded together by the master (see fold_snapshot)
+EXITED_FILENAME = 'exited.json'
+# Recently folded worker instances, so a scrape that still sees a folded worker's own file skips it
+MAX_FOLDED = 64
+
+HELP = {
+    'cvisual_http_requests_total': ('counter', 'Requests by endpoint, method and status code.'),
+    'cvisual_http_request_duration_seconds': ('histogram', 'Request latency, including streamed bodies.'),
+    'cvisual_http_response_size_bytes': ('histogram', 'Response body size (streamed bodies are not sized).'),
+    'cvisual_db_statements_per_request': ('histogram', 'SQL statements executed per request.'),
+    'cvisual_db_statements_total': ('counter', 'SQL statements executed while serving requests.'),
+    'cvisual_db_statement_seconds_total': ('counter', 'Time spent in SQL statements while serving requests.'),
+}
+
+def _labels(**labels):
+    return tuple(sorted(labels.items()))
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+def _number(value):
+    # repr keeps full precision; %g would turn 1234567 into 1.23457e+06
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _read_snapshot(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None # Removed or replaced mid-read; picked up on the next scrape
+
+def _merge(snapshots):
+    # Sums counters, histograms and pool counters across snapshots; returns
+    # (counters, histograms, pool_totals, pool_wait_seconds) keyed by (name, labels)
+    counters = {}
+    histograms = {}
+    pool_totals = dict.fromkeys(POOL_COUNTERS, 0)
+    pool_wait_seconds = 0.0
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, h in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = {**h, 'counts': list(h['counts'])}
+            else:
+                merged['counts'] = [a + b for a, b in zip(merged['counts'], h['counts'])]
+                merged['sum'] += h['sum']
+                merged['count'] += h['count']
+        pool = snapshot.get('pool') or {}
+        for name in POOL_COUNTERS:
+            pool_totals[name] += pool.get(name, 0)
+        pool_wait_seconds += pool.get('wait_seconds_total', 0)
+    return counters, histograms, pool_totals, pool_wait_seconds
+
+def fold_snapshot(directory, pid):
+    """Fold an exited worker's snapshot into METRICS_DIR/exited.json and delete it.
+
+    Called by the gunicorn master from child_exit, one worker at a time. The
+    aggregate is replaced atomically before the worker file is removed, and
+    records the worker's instance so scrapes in between don't count it twice.
+    """
+    path = os.path.join(directory, f"{pid}.json")
+    snapshot = _read_snapshot(path)
+    if snapshot is None:
+        return
+    exited_path = os.path.join(directory, EXITED_FILENAME)
+    exited = _read_snapshot(exited_path) or {'counters': [], 'histograms': [], 'pool': {}, 'folded': []}
+    counters, histograms, pool_totals, pool_wait_seconds = _merge([exited, snapshot])
+
+    folded = exited.get('folded', []) + ([snapshot['instance']] if snapshot.get('instance') else [])
+    aggregate = {
+        'pid': None,
+        'folded': folded[-MAX_FOLDED:],
+        'counters': [[name, list(map(list, labels)), value] for (name, labels), value in counters.items()],
+        'histograms': [[name, list(map(list, labels)), h] for (name, labels), h in histograms.items()],
+        'pool': {**pool_totals, 'wait_seconds_total': pool_wait_seconds},
+    }
+    tmp_path = f"{exited_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(aggregate, f)
+    os.replace(tmp_path, exited_path)
+    os.remove(path)
+
+class RequestMetrics:
+    """Per-endpoint request and SQL metrics, rendered in the Prometheus text format.
+
+    Each process records in memory. With METRICS_DIR set, every process
+    also writes a snapshot to METRICS_DIR/<pid>.json at most every
+    METRICS_FLUSH_INTERVAL seconds (and when its gunicorn worker exits), and
+    /metrics sums the snapshots of all workers, so any worker can answer a
+    scrape. When a worker exits the master folds its snapshot into
+    METRICS_DIR/exited.json and removes the per-pid file, so recycled workers
+    neither pile up nor collide with a new worker that reuses their pid.
+    Without METRICS_DIR only the answering process is reported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.directory = None
+        self.flush_interval = 5.0
+        self.token = None
+        self._last_flush = 0.0
+        self._instance_pid = None
+        self._instance = None
+        self.counters = {}
+        self.histograms = {}
+
+    def init_app(self, app):
+        self.directory = app.config.setdefault('METRICS_DIR', os.getenv('METRICS_DIR'))
+        self.flush_interval = app.config.setdefault('METRICS_FLUSH_INTERVAL', float(os.getenv('METRICS_FLUSH_INTERVAL', 5)))
+        self.token = app.config.setdefault('METRICS_TOKEN', os.getenv('METRICS_TOKEN'))
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        app.before_request(self._start_request)
+        app.after_request(self._capture_response)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def attach(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    # --- SQL EVENTS ---
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Kept on the statement's own execution context: a statement that fails never reaches
+        # after_cursor_execute, and its start time is discarded with the context
+        if context is not None:
+            context._cvisual_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_cvisual_query_start', None)
+        if started is None:
+            return
+        # Statements from the job worker or the contact queue flusher have no request to charge
+        if has_request_context():
+            state = request.environ.get(ENVIRON_KEY)
+            if state is not None:
+                state['sql_count'] += 1
+                state['sql_seconds'] += time.perf_counter() - started
+
+    # --- REQUEST HOOKS ---
+    def _start_request(self):
+        request.environ[ENVIRON_KEY] = {
+            'started': time.perf_counter(), 'sql_count': 0, 'sql_seconds': 0.0,
+        }
+
+    def _capture_response(self, response):
+        state = request.environ.get(ENVIRON_KEY)
+        if state is not None:
+            # url_rule keeps label cardinality bounded: /api/portfolio/<int:id>, not every id
+            state['endpoint'] = request.url_rule.rule if request.url_rule else 'unmatched'
+            state['method'] = request.method
+            state['status'] = response.status_code
+            state['size'] = None if response.is_streamed else response.content_length
+            # Recorded once the server closes the response, so a streamed export's time and SQL count too
+            response.call_on_close(lambda: self._record(state))
+        return response
+
+    def _record(self, state):
+        endpoint, method = state['endpoint'], state['method']
+        duration = time.perf_counter() - state['started']
+
+        with self._lock:
+            self._incr('cvisual_http_requests_total', _labels(endpoint=endpoint, method=method, status=state['status']))
+            self._observe('cvisual_http_request_duration_seconds', _labels(endpoint=endpoint, method=method),
+                          duration, LATENCY_BUCKETS)
+            if state['size'] is not None:
+                self._observe('cvisual_http_response_size_bytes', _labels(endpoint=endpoint), state['size'], SIZE_BUCKETS)
+            self._observe('cvisual_db_statements_per_request', _labels(endpoint=endpoint), state['sql_count'], SQL_COUNT_BUCKETS)
+            self._incr('cvisual_db_statements_total', _labels(endpoint=endpoint), state['sql_count'])
+            self._incr('cvisual_db_statement_seconds_total', _labels(endpoint=endpoint), state['sql_seconds'])
+
+        if self.directory and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _incr(self, name, labels, amount=1):
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + amount
+
+    def _observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = {'buckets': list(buckets), 'counts': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+        for i, bound in enumerate(histogram['buckets']):
+            if value <= bound:
+                histogram['counts'][i] += 1
+        histogram['sum'] += value
+        histogram['count'] += 1
+
+    # --- AGGREGATION ---
+    def instance(self):
+        # Unique per process, even when the OS hands a dead worker's pid to a new one
+        if self._instance_pid != os.getpid():
+            self._instance_pid = os.getpid()
+            self._instance = f"{self._instance_pid}-{time.time_ns()}"
+        return self._instance
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'instance': self.instance(),
+                'counters': [[name, list(map(list, labels)), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(map(list, labels)), {**h, 'counts': list(h['counts'])}] for (name, labels), h in self.histograms.items()],
+                'pool': pool_metrics.stats(),
+            }
+
+    def flush(self):
+        # Written to a temp file and renamed, so a scrape never reads half a snapshot
+        self._last_flush = time.monotonic()
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _snapshots(self):
+        own = self.snapshot()
+        snapshots = [own]
+        if self.directory:
+            for filename in os.listdir(self.directory):
+                if not filename.endswith('.json') or filename in (f"{own['pid']}.json", EXITED_FILENAME):
+                    continue
+                snapshot = _read_snapshot(os.path.join(self.directory, filename))
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+            # Read last: the master writes it before deleting the worker file it folded, so a
+            # worker is either still in its own file or already in here, never neither
+            exited = _read_snapshot(os.path.join(self.directory, EXITED_FILENAME))
+            if exited is not None:
+                folded = set(exited.get('folded', ()))
+                snapshots = [s for s in snapshots if s.get('instance') not in folded]
+                snapshots.append(exited)
+        return snapshots
+
+    def render(self):
+        snapshots = self._snapshots()
+        counters, histograms, pool_totals, pool_wait_seconds = _merge(snapshots)
+
+        pool_gauges = []
+        for snapshot in snapshots:
+            pool = snapshot.get('pool') or {}
+            # Gauges only make sense for processes that are still running (the exited aggregate has no pid)
+            if snapshot.get('pid') is not None and (snapshot['pid'] == os.getpid() or _pid_alive(snapshot['pid'])):
+                pool_gauges.extend(
+                    (name, snapshot['pid'], pool[name]) for name in POOL_GAUGES if pool.get(name) is not None
+                )
+
+        lines = []
+        for metric in HELP:
+            kind, description = HELP[metric]
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            if kind == 'counter':
+                for (name, labels), value in sorted(counters.items()):
+                    if name == metric:
+                        lines.append(f"{metric}{_format_labels(labels)} {_number(value)}")
+                continue
+            for (name, labels), h in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                for bound, count in zip(h['buckets'], h['counts']):
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', _number(bound)),))} {count}")
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {h['count']}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {_number(h['sum'])}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {h['count']}")
+
+        for name in POOL_COUNTERS:
+            lines.append(f"# TYPE cvisual_db_pool_{name}_total counter")
+            lines.append(f"cvisual_db_pool_{name}_total {pool_totals[name]}")
+        lines.append("# TYPE cvisual_db_pool_wait_seconds_total counter")
+        lines.append(f"cvisual_db_pool_wait_seconds_total {_number(pool_wait_seconds)}")
+        for name in POOL_GAUGES:
+            lines.append(f"# TYPE cvisual_db_pool_{name} gauge")
+            for gauge, pid, value in pool_gauges:
+                if gauge == name:
+                    lines.append(f'cvisual_db_pool_{name}{{pid="{pid}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        if self.token and request.headers.get('Authorization') != f"Bearer {self.token}":
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,28 @@
+"""Add contact_inquiry listing indexes
+
+Revision ID: 3b7f1c2d8e4a
+Revises: 9204e2e1c169
+Create Date: 2026-10-18 09:12:40.118253
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7f1c2d8e4a'
+down_revision = '9204e2e1c169'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('contact_inquiry', schema=None) as batch_op:
+        batch_op.create_index('ix_contact_inquiry_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index('ix_contact_inquiry_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('contact_inquiry', schema=None) as batch_op:
+        batch_op.drop_index('ix_contact_inquiry_created_at')
+        batch_op.drop_index('ix_contact_inquiry_status_created_at')
@@ -0,0 +1,36 @@
+"""Add content_version table
+
+Revision ID: 5d2a9e7c4b1f
+Revises: 3b7f1c2d8e4a
+Create Date: 2026-10-18 10:03:11.402917
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2a9e7c4b1f'
+down_revision = '3b7f1c2d8e4a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    content_version = op.create_table('content_version',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    now = datetime.utcnow()
+    op.bulk_insert(content_version, [
+        {'name': 'portfolio', 'version': 1, 'updated_at': now},
+        {'name': 'services', 'version': 1, 'updated_at': now},
+    ])
+
+
+def downgrade():
+    op.drop_table('content_version')
@@ -0,0 +1,31 @@
+"""Normalise subscriber emails and index lower(email)
+
+Revision ID: 8e1f4a6b2c9d
+Revises: 5d2a9e7c4b1f
+Create Date: 2026-10-18 11:26:53.730145
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e1f4a6b2c9d'
+down_revision = '5d2a9e7c4b1f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the oldest row of any case/whitespace variants, then store everything lowercased
+    op.execute(
+        'DELETE FROM newsletter_subscriber WHERE id NOT IN '
+        '(SELECT MIN(id) FROM newsletter_subscriber GROUP BY lower(trim(email)))'
+    )
+    op.execute('UPDATE newsletter_subscriber SET email = lower(trim(email))')
+    op.create_index('ix_newsletter_subscriber_email_lower', 'newsletter_subscriber',
+                    [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_newsletter_subscriber_email_lower', table_name='newsletter_subscriber')
@@ -0,0 +1,46 @@
+"""Index hot query paths
+
+Revision ID: c7d9e1f3a5b2
+Revises: a4c6e8f0b2d1
+Create Date: 2026-10-18 13:58:22.904716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d9e1f3a5b2'
+down_revision = 'a4c6e8f0b2d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_project_created_at'), ['created_at'], unique=False)
+        batch_op.create_index('ix_project_category_industry', ['category', 'industry'], unique=False)
+
+    with op.batch_alter_table('project_image', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_project_image_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('project_metric', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_project_metric_project_id'), ['project_id'], unique=False)
+
+    with op.batch_alter_table('newsletter_subscriber', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_newsletter_subscriber_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('newsletter_subscriber', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_newsletter_subscriber_created_at'))
+
+    with op.batch_alter_table('project_metric', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_project_metric_project_id'))
+
+    with op.batch_alter_table('project_image', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_project_image_project_id'))
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_category_industry')
+        batch_op.drop_index(batch_op.f('ix_project_created_at'))
@@ -0,0 +1,90 @@
+"""Full-text search index on contact inquiries
+
+Revision ID: e2b4d6f8a0c3
+Revises: c7d9e1f3a5b2
+Create Date: 2026-10-18 16:42:10.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b4d6f8a0c3'
+down_revision = 'c7d9e1f3a5b2'
+branch_labels = None
+depends_on = None
+
+# Copied rather than imported from search.py, so this revision keeps creating
+# the same index whatever the application code becomes.
+POSTGRES_UPGRADE = [
+    """
+    ALTER TABLE contact_inquiry ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') ||
+        setweight(to_tsvector('simple', regexp_replace(coalesce(email, ''), '[@._+-]', ' ', 'g')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(message, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_contact_inquiry_search_vector ON contact_inquiry USING GIN (search_vector)",
+]
+
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_contact_inquiry_search_vector",
+    "ALTER TABLE contact_inquiry DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_UPGRADE = [
+    "DROP TRIGGER IF EXISTS contact_inquiry_fts_au",
+    "DROP TRIGGER IF EXISTS contact_inquiry_fts_ad",
+    "DROP TRIGGER IF EXISTS contact_inquiry_fts_ai",
+    "DROP TABLE IF EXISTS contact_inquiry_fts",
+    """
+    CREATE VIRTUAL TABLE contact_inquiry_fts USING fts5(
+        first_name, last_name, email, company, message,
+        content='contact_inquiry', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER contact_inquiry_fts_ai AFTER INSERT ON contact_inquiry BEGIN
+        INSERT INTO contact_inquiry_fts(rowid, first_name, last_name, email, company, message)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.company, new.message);
+    END
+    """,
+    """
+    CREATE TRIGGER contact_inquiry_fts_ad AFTER DELETE ON contact_inquiry BEGIN
+        INSERT INTO contact_inquiry_fts(contact_inquiry_fts, rowid, first_name, last_name, email, company, message)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.company, old.message);
+    END
+    """,
+    """
+    CREATE TRIGGER contact_inquiry_fts_au AFTER UPDATE OF first_name, last_name, email, company, message ON contact_inquiry BEGIN
+        INSERT INTO contact_inquiry_fts(contact_inquiry_fts, rowid, first_name, last_name, email, company, message)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.company, old.message);
+        INSERT INTO contact_inquiry_fts(rowid, first_name, last_name, email, company, message)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.company, new.message);
+    END
+    """,
+    "INSERT INTO contact_inquiry_fts(contact_inquiry_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS contact_inquiry_fts_au",
+    "DROP TRIGGER IF EXISTS contact_inquiry_fts_ad",
+    "DROP TRIGGER IF EXISTS contact_inquiry_fts_ai",
+    "DROP TABLE IF EXISTS contact_inquiry_fts",
+]
+
+
+def run(statements):
+    dialect = op.get_bind().dialect.name
+    for statement in statements.get(dialect, []):
+        op.execute(sa.text(statement))
+
+
+def upgrade():
+    run({'postgresql': POSTGRES_UPGRADE, 'sqlite': SQLITE_UPGRADE})
+
+
+def downgrade():
+    run({'postgresql': POSTGRES_DOWNGRADE, 'sqlite': SQLITE_DOWNGRADE})
@@ -0,0 +1,30 @@
+"""Add spooled_file table
+
+Revision ID: f5a7c9e1b3d6
+Revises: e2b4d6f8a0c3
+Create Date: 2026-10-18 18:12:44.508117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5a7c9e1b3d6'
+down_revision = 'e2b4d6f8a0c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('spooled_file',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=True),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('spooled_file')
@@ -23,21 +23,26 @@ class Project(db.Model):
     testimonial_author = db.Column(db.String(100))
     testimonial_role = db.Column(db.String(100))
     live_link = db.Column(db.String(255)) # Optional link to live site
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationship for gallery
     gallery = db.relationship('ProjectImage', backref='project', lazy=True, cascade="all, delete-orphan")
     # Relationship for metrics
     metrics = db.relationship('ProjectMetric', backref='project', lazy=True, cascade="all, delete-orphan")
 
+    # Portfolio filters: category alone, or category + industry
+    __table_args__ = (
+        db.Index('ix_project_category_industry', 'category', 'industry'),
+    )
+
 class ProjectImage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     image_url = db.Column(db.String(255), nullable=False)
 
 class ProjectMetric(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False, index=True)
     label = db.Column(db.String(100), nullable=False) # e.g., "Augmentation des Ventes"
     value = db.Column(db.String(50), nullable=False) # e.g., "+250%"
 
@@ -65,7 +70,47 @@ class ContactInquiry(db.Model):
     status = db.Column(db.String(20), default='pending') # pending, contacted, closed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Inbox listing: newest first, optionally filtered by status
+    __table_args__ = (
+        db.Index('ix_contact_inquiry_status_created_at', 'status', 'created_at'),
+        db.Index('ix_contact_inquiry_created_at', 'created_at'),
+    )
+
 class NewsletterSubscriber(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    email = db.Column(db.String(120), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False) # Stored lowercased
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+# Guards case-insensitive uniqueness even for writers that skip normalisation
+db.Index('ix_newsletter_subscriber_email_lower', db.func.lower(NewsletterSubscriber.email), unique=True)
+
+class ContentVersion(db.Model):
+    # One row per public resource; bumped whenever its tables are written to
+    name = db.Column(db.String(50), primary_key=True) # e.g., "portfolio", "services"
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Job(db.Model):
+    # Background work run by worker.py
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False) # e.g., "notify_new_inquiry"
+    payload = db.Column(db.Text, nullable=False, default='{}') # JSON
+    status = db.Column(db.String(20), nullable=False, default='queued') # queued, running, done, dead
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Worker polling: next due job in a given status
+    __table_args__ = (
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+    )
+
+class SpooledFile(db.Model):
+    # Upload bytes waiting for a job; kept in the database so a worker on another machine can read them
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(255))
+    data = db.Column(db.LargeBinary, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,85 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Cold-start report: what importing app.py costs, module by module, and how long a
+# fresh process takes to answer its first /api/health. Each measurement runs in a
+# new interpreter so nothing is already imported or connected.
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+TOP_MODULES = 15
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# Timed inside the child; perf_counter starts before anything of ours is imported
+COLD_START = '''
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+first = client.get('/api/health')
+first_done = time.perf_counter()
+second = client.get('/api/health')
+second_done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_health_ms": (first_done - imported) * 1000,
+    "second_health_ms": (second_done - first_done) * 1000,
+    "status": first.status_code,
+    "health": first.get_json(),
+    "heavy_modules_loaded": [m for m in ("cloudinary", "flask_migrate", "alembic") if m in __import__("sys").modules],
+}))
+'''
+
+def run(args):
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, capture_output=True, text=True)
+
+def import_profile():
+    result = run(['-X', 'importtime', '-c', 'import app'])
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), len(indent)))
+    return modules
+
+def report():
+    print(f"Database: {os.getenv('DATABASE_URL', 'sqlite:///cvisual.db')}")
+
+    modules = import_profile()
+    app_index = next((i for i, m in enumerate(modules) if m[0] == 'app'), None)
+    if app_index is None:
+        print("Could not profile 'import app'")
+        return
+    app_entry = modules[app_index]
+    # importtime lists children before their parent: app.py's own imports are the
+    # entries one level deeper between the previous top-level module and app itself
+    first = app_index
+    while first > 0 and modules[first - 1][3] > app_entry[3]:
+        first -= 1
+    direct = [m for m in modules[first:app_index] if m[3] == app_entry[3] + 2]
+    print(f"\n=== import app: {app_entry[2] / 1000:.1f} ms")
+    print(f"{'module':<30}{'cumulative ms':>15}")
+    for name, _, cumulative_us, _ in sorted(direct, key=lambda m: -m[2])[:TOP_MODULES]:
+        print(f"{name:<30}{cumulative_us / 1000:>15.1f}")
+
+    print(f"\n=== slowest modules by self time")
+    for name, self_us, _, _ in sorted(modules, key=lambda m: -m[1])[:TOP_MODULES]:
+        print(f"{name:<50}{self_us / 1000:>10.1f}")
+
+    result = run(['-c', COLD_START])
+    if result.returncode != 0:
+        print(result.stderr)
+        return
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    print(f"\n=== cold start")
+    print(f"import + create_app     {timings['import_ms']:>10.1f} ms")
+    print(f"first /api/health       {timings['first_health_ms']:>10.1f} ms ({timings['status']}, {timings['health']})")
+    print(f"second /api/health      {timings['second_health_ms']:>10.1f} ms")
+    print(f"time to first response  {timings['import_ms'] + timings['first_health_ms']:>10.1f} ms")
+    print(f"heavy modules loaded    {', '.join(timings['heavy_modules_loaded']) or 'none'}")
+
+if __name__ == "__main__":
+    report()
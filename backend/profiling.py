@@ -0,0 +1,120 @@
+import cProfile
+import hmac
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from flask import request, has_request_context
+from sqlalchemy import event
+
+ENVIRON_KEY = 'cvisual.profiler'
+MAX_PARAMS_LENGTH = 500
+
+class RequestProfiler:
+    """Opt-in diagnostics: a slow-query log and per-request cProfile captures.
+
+    Nothing is registered unless PROFILING=1, so a normal deployment runs
+    no extra hooks or engine listeners. When enabled:
+
+    - any SQL statement slower than SLOW_QUERY_MS is printed with its bound
+      parameters and the route that ran it;
+    - a PROFILE_SAMPLE_RATE fraction of requests, plus any request sending
+      `X-Profile: <PROFILE_TOKEN>`, is profiled and written to PROFILE_DIR
+      as a .prof file (open with `python -m pstats`, snakeviz or flameprof).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_seconds = 0.2
+        self.sample_rate = 0.0
+        self.token = None
+        self.directory = None
+        # cProfile can only run one profiler per interpreter (3.12+), so captures never overlap
+        self._capture_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config.setdefault('PROFILING', os.getenv('PROFILING', '0') == '1')
+        if not self.enabled:
+            return
+        self.slow_query_seconds = app.config.setdefault('SLOW_QUERY_MS', int(os.getenv('SLOW_QUERY_MS', 200))) / 1000
+        self.sample_rate = app.config.setdefault('PROFILE_SAMPLE_RATE', float(os.getenv('PROFILE_SAMPLE_RATE', 0)))
+        self.token = app.config.setdefault('PROFILE_TOKEN', os.getenv('PROFILE_TOKEN'))
+        self.directory = app.config.setdefault(
+            'PROFILE_DIR', os.getenv('PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+        )
+        os.makedirs(self.directory, exist_ok=True)
+
+        from models import db
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+        app.before_request(self._start_profile)
+        app.after_request(self._stop_profile)
+        app.teardown_request(self._finish_profile)
+        print(f"Profiling enabled: slow queries > {self.slow_query_seconds * 1000:.0f} ms, "
+              f"sample rate {self.sample_rate}, profiles in {self.directory}")
+
+    # --- SLOW QUERIES ---
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, not a per-connection stack: a failed statement never reaches
+        # after_cursor_execute and would leave its start time behind for the next one
+        if context is not None:
+            context._cvisual_profile_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_cvisual_profile_query_start', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed < self.slow_query_seconds:
+            return
+        origin = f"{request.method} {request.path}" if has_request_context() else 'background'
+        params = repr(parameters)
+        if len(params) > MAX_PARAMS_LENGTH:
+            params = params[:MAX_PARAMS_LENGTH] + '...'
+        print(f"SLOW QUERY {elapsed * 1000:.1f} ms [{origin}] {' '.join(statement.split())} -- params: {params}")
+
+    # --- REQUEST PROFILES ---
+    def _requested(self):
+        header = request.headers.get('X-Profile')
+        if header and self.token and hmac.compare_digest(header, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _start_profile(self):
+        if not self._requested() or not self._capture_lock.acquire(blocking=False):
+            return
+        profiler = cProfile.Profile()
+        request.environ[ENVIRON_KEY] = (profiler, time.perf_counter())
+        profiler.enable()
+
+    def _stop_profile(self, response):
+        capture = request.environ.get(ENVIRON_KEY)
+        if capture is None:
+            return response
+        profiler, started = capture
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        route = re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_') or 'root'
+        filename = f"{datetime.utcnow():%Y%m%d-%H%M%S-%f}-{request.method}-{route}-{elapsed_ms:.0f}ms-{os.getpid()}.prof"
+        try:
+            profiler.dump_stats(os.path.join(self.directory, filename))
+        except Exception as e:
+            # A full disk or a missing directory must not turn the profiled request into a 500
+            print(f"Could not write profile {filename}: {e}")
+        else:
+            response.headers['X-Profile-File'] = filename
+        return response
+
+    def _finish_profile(self, exc):
+        # Teardown always runs, even when another after_request hook raised before ours
+        capture = request.environ.pop(ENVIRON_KEY, None)
+        if capture is None:
+            return
+        profiler, _ = capture
+        profiler.disable()
+        self._capture_lock.release()
+
+request_profiler = RequestProfiler()
@@ -1,12 +1,44 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from werkzeug.security import check_password_hash
 from models import db, Admin, Project, ProjectImage, ProjectMetric, Service, ContactInquiry, NewsletterSubscriber
-import cloudinary.uploader
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only, selectinload
+from pagination import keyset_page, parse_limit, InvalidCursor
+from search import ranked_search, search_terms, excerpt
+from exports import stream_rows, csv_stream, ndjson_stream
+from subscribers import normalize_email, is_valid_email, subscribe_email, parse_email_upload, bulk_import
+from contact_queue import contact_queue
+from jobs import enqueue_inquiry_notification, spool_gallery_upload
+from versioning import conditional, version_key
+from cache import cached, response_cache
+from db_pool import pool_metrics, warm_pool
+from uploads import get_uploader, upload_many, sign_upload, is_hosted_image
 import json
+import time
+from datetime import datetime, timedelta
 
 api = Blueprint('api', __name__)
 
+# --- HEALTH ---
+@api.route('/health', methods=['GET'])
+def health():
+    # Readiness probe: fails until the database answers, and warms the pool on the way
+    started = time.perf_counter()
+    try:
+        connections = warm_pool(db.engine, current_app.config.get('DB_POOL_WARM', 2))
+    except Exception as e:
+        print(f"Health check failed: {e}")
+        return jsonify({"status": "unavailable", "error": "database unreachable"}), 503
+    response = jsonify({
+        "status": "ok",
+        "database": db.engine.dialect.name,
+        "connections_warmed": connections,
+        "db_ms": round((time.perf_counter() - started) * 1000, 2)
+    })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
 # --- AUTH ---
 @api.route('/auth/login', methods=['POST'])
 def login():
@@ -18,33 +50,103 @@ def login():
     return jsonify({"msg": "Bad username or password"}), 401
 
 # --- PORTFOLIO ---
+# Serializable project fields, in response order: (getter, columns it reads).
+# `summary` is opt-in only: the first 100 characters of the challenge, for list cards.
+PROJECT_FIELDS = {
+    'id': (lambda p: p.id, ['id']),
+    'title': (lambda p: p.title, ['title']),
+    'category': (lambda p: p.category, ['category']),
+    'industry': (lambda p: p.industry, ['industry']),
+    'date': (lambda p: p.date, ['date']),
+    'client': (lambda p: p.client, ['client']),
+    'duration': (lambda p: p.duration, ['duration']),
+    'main_image': (lambda p: p.main_image, ['main_image']),
+    'challenge': (lambda p: p.challenge, ['challenge']),
+    'solution': (lambda p: p.solution, ['solution']),
+    'testimonial': (lambda p: {
+        'text': p.testimonial_text,
+        'author': p.testimonial_author,
+        'role': p.testimonial_role
+    }, ['testimonial_text', 'testimonial_author', 'testimonial_role']),
+    'gallery': (lambda p: [img.image_url for img in p.gallery], []),
+    'metrics': (lambda p: [{'label': m.label, 'value': m.value} for m in p.metrics], []),
+    'live_link': (lambda p: p.live_link, ['live_link']),
+    'summary': (lambda p: (p.challenge or '')[:100], ['challenge']),
+}
+DEFAULT_PROJECT_FIELDS = [name for name in PROJECT_FIELDS if name != 'summary']
+
+def serialize_project(p, fields=DEFAULT_PROJECT_FIELDS):
+    return {name: PROJECT_FIELDS[name][0](p) for name in fields}
+
+def parse_project_fields(value):
+    # `fields=title,main_image` sparse fieldset; raises ValueError on unknown names
+    if not value:
+        return DEFAULT_PROJECT_FIELDS
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in PROJECT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    # The id is always sent so clients can fetch /portfolio/<id> for the rest
+    return ['id'] + [name for name in dict.fromkeys(fields) if name != 'id']
+
+def project_query(fields):
+    # Only the requested columns are selected, and gallery/metrics only loaded when asked for
+    columns = {'id', 'created_at'} # created_at orders and pages the list
+    for name in fields:
+        columns.update(PROJECT_FIELDS[name][1])
+    options = [load_only(*[getattr(Project, column) for column in sorted(columns)])]
+    if 'gallery' in fields:
+        options.append(selectinload(Project.gallery))
+    if 'metrics' in fields:
+        options.append(selectinload(Project.metrics))
+    return Project.query.options(*options)
+
 @api.route('/portfolio', methods=['GET'])
+@conditional('portfolio')
+@cached('portfolio', version=version_key)
 def get_projects():
-    projects = Project.query.order_by(Project.created_at.desc()).all()
-    output = []
-    for p in projects:
-        project_data = {
-            'id': p.id,
-            'title': p.title,
-            'category': p.category,
-            'industry': p.industry,
-            'date': p.date,
-            'client': p.client,
-            'duration': p.duration,
-            'main_image': p.main_image,
-            'challenge': p.challenge,
-            'solution': p.solution,
-            'testimonial': {
-                'text': p.testimonial_text,
-                'author': p.testimonial_author,
-                'role': p.testimonial_role
-            },
-            'gallery': [img.image_url for img in p.gallery],
-            'metrics': [{'label': m.label, 'value': m.value} for m in p.metrics],
-            'live_link': p.live_link
-        }
-        output.append(project_data)
-    return jsonify(output)
+    try:
+        fields = parse_project_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Gallery and metrics, when requested, load in one batched query each (3 queries total, whatever N is)
+    query = project_query(fields)
+
+    category = request.args.get('category')
+    industry = request.args.get('industry')
+    if category:
+        query = query.filter(Project.category == category)
+    if industry:
+        query = query.filter(Project.industry == industry)
+
+    # Pagination is opt-in so existing clients keep receiving the full list
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        projects = query.order_by(Project.created_at.desc()).all()
+        return jsonify([serialize_project(p, fields) for p in projects])
+
+    try:
+        projects, next_cursor = keyset_page(
+            query, Project,
+            cursor=request.args.get('cursor'),
+            limit=parse_limit(request.args.get('limit'))
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+    return jsonify({
+        'items': [serialize_project(p, fields) for p in projects],
+        'next_cursor': next_cursor
+    })
+
+@api.route('/portfolio/<int:id>', methods=['GET'])
+@conditional('portfolio')
+@cached('portfolio', version=version_key)
+def get_project(id):
+    try:
+        fields = parse_project_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    project = project_query(fields).filter(Project.id == id).first_or_404()
+    return jsonify(serialize_project(project, fields))
 
 @api.route('/portfolio', methods=['POST'])
 @jwt_required()
@@ -64,13 +166,21 @@ def add_project():
         testimonial_role = request.form.get('testimonial_role', '')
         live_link = request.form.get('live_link', '')
         
-        # Handle main image upload to Cloudinary
+        # Handle main image: either already uploaded directly by the browser, or sent here
         file_to_upload = request.files.get('main_image')
-        main_image_url = ""
+        main_image_url = request.form.get('main_image_url', '')
+        if main_image_url and not is_hosted_image(main_image_url):
+            return jsonify({"error": "main_image_url must be an image hosted on our Cloudinary account"}), 400
+        # Gallery images the browser already uploaded directly; checked before anything is uploaded or committed
+        try:
+            gallery_urls = json.loads(request.form.get('gallery_urls') or '[]')
+        except json.JSONDecodeError:
+            gallery_urls = None
+        if not isinstance(gallery_urls, list):
+            return jsonify({"error": "gallery_urls must be a JSON list of URLs"}), 400
         if file_to_upload:
             try:
-                upload_result = cloudinary.uploader.upload(file_to_upload, folder="cvisual/portfolio")
-                main_image_url = upload_result.get('secure_url')
+                main_image_url = get_uploader()(file_to_upload, "cvisual/portfolio")
             except Exception as e:
                 return jsonify({"error": f"Cloudinary upload failed: {str(e)}"}), 500
 
@@ -82,32 +192,48 @@ def add_project():
             testimonial_role=testimonial_role, live_link=live_link
         )
         
-        db.session.add(new_project)
-        db.session.commit()
-        
-        # Handle gallery images
-        gallery_files = request.files.getlist('gallery')
-        for f in gallery_files:
-            if f:
-                try:
-                    up_res = cloudinary.uploader.upload(f, folder=f"cvisual/portfolio/{new_project.id}")
-                    img = ProjectImage(project_id=new_project.id, image_url=up_res.get('secure_url'))
-                    db.session.add(img)
-                except Exception as e:
-                    print(f"Gallery image upload failed: {e}")
-                
         # Handle metrics (expected as JSON string in form data)
         metrics_str = request.form.get('metrics', '[]')
         try:
             metrics = json.loads(metrics_str)
             for m in metrics:
-                metric = ProjectMetric(project_id=new_project.id, label=m.get('label'), value=m.get('value'))
-                db.session.add(metric)
+                new_project.metrics.append(ProjectMetric(label=m.get('label'), value=m.get('value')))
         except json.JSONDecodeError:
             print("Invalid metrics JSON, skipping")
-            
+
+        db.session.add(new_project)
+        db.session.flush()
+        project_id = new_project.id
+        # Commit before the slow uploads so no connection is held while they run
         db.session.commit()
-        return jsonify({"message": "Project added successfully", "id": new_project.id}), 201
+
+        # Handle gallery images: handed to the job worker, or uploaded concurrently right here
+        gallery_files = [f for f in request.files.getlist('gallery') if f]
+        deferred = 0
+        if current_app.config.get('DEFER_GALLERY_UPLOADS'):
+            for f in gallery_files:
+                spool_gallery_upload(project_id, f)
+            deferred, gallery_files = len(gallery_files), []
+        results = upload_many(gallery_files, f"cvisual/portfolio/{project_id}")
+        # Images the browser already uploaded directly are recorded as-is
+        results += [
+            (url, url, None) if is_hosted_image(url) else (str(url), None, "Not an image hosted on our Cloudinary account")
+            for url in gallery_urls
+        ]
+        db.session.add_all([
+            ProjectImage(project_id=project_id, image_url=url)
+            for _, url, error in results if error is None
+        ])
+        db.session.commit()
+
+        failed = [{'file': filename, 'error': error} for filename, _, error in results if error is not None]
+        for f in failed:
+            print(f"Gallery image upload failed: {f['file']}: {f['error']}")
+        return jsonify({
+            "message": "Project added successfully",
+            "id": project_id,
+            "gallery": {"uploaded": len(results) - len(failed), "deferred": deferred, "failed": failed}
+        }), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -131,12 +257,16 @@ def update_project(id):
         project.testimonial_role = request.form.get('testimonial_role', project.testimonial_role)
         project.live_link = request.form.get('live_link', project.live_link)
         
-        # Handle main image update if a new file is provided
+        # Handle main image update if a new file (or directly uploaded URL) is provided
+        main_image_url = request.form.get('main_image_url')
+        if main_image_url:
+            if not is_hosted_image(main_image_url):
+                return jsonify({"error": "main_image_url must be an image hosted on our Cloudinary account"}), 400
+            project.main_image = main_image_url
         file_to_upload = request.files.get('main_image')
         if file_to_upload:
             try:
-                upload_result = cloudinary.uploader.upload(file_to_upload, folder="cvisual/portfolio")
-                project.main_image = upload_result.get('secure_url')
+                project.main_image = get_uploader()(file_to_upload, "cvisual/portfolio")
             except Exception as e:
                 return jsonify({"error": f"Cloudinary upload failed: {str(e)}"}), 500
 
@@ -146,6 +276,36 @@ def update_project(id):
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+@api.route('/portfolio/<int:id>/images', methods=['POST'])
+@jwt_required()
+def add_project_images(id):
+    # Records gallery images the browser uploaded straight to Cloudinary
+    Project.query.get_or_404(id)
+    urls = (request.get_json(silent=True) or {}).get('urls', [])
+    if not isinstance(urls, list) or not urls:
+        return jsonify({"error": "Expected a non-empty 'urls' list"}), 400
+    invalid = [url for url in urls if not is_hosted_image(url)]
+    if invalid:
+        return jsonify({"error": "Only images hosted on our Cloudinary account can be recorded", "invalid": invalid}), 400
+
+    db.session.add_all([ProjectImage(project_id=id, image_url=url) for url in urls])
+    db.session.commit()
+    return jsonify({"message": "Images added successfully", "added": len(urls)}), 201
+
+# --- UPLOADS ---
+@api.route('/uploads/signature', methods=['POST'])
+@jwt_required()
+def get_upload_signature():
+    # Signed parameters let the admin UI upload straight to Cloudinary, bypassing this worker
+    project_id = (request.get_json(silent=True) or {}).get('project_id')
+    if project_id is not None and not isinstance(project_id, int):
+        return jsonify({"error": "project_id must be an integer"}), 400
+    folder = f"cvisual/portfolio/{project_id}" if project_id else "cvisual/portfolio"
+    params = sign_upload(folder)
+    if params is None:
+        return jsonify({"error": "Cloudinary is not configured"}), 503
+    return jsonify(params)
+
 @api.route('/portfolio/<int:id>', methods=['DELETE'])
 @jwt_required()
 def delete_project(id):
@@ -159,43 +319,78 @@ def delete_project(id):
         return jsonify({"error": str(e)}), 500
 
 # --- CONTACT ---
+# Form field -> (model column, max length, required)
+CONTACT_FIELDS = {
+    'firstName': ('first_name', 80, True),
+    'lastName': ('last_name', 80, True),
+    'email': ('email', 120, True),
+    'phone': ('phone', 20, True),
+    'company': ('company', 100, False),
+    'service': ('service_type', 50, False),
+    'budget': ('budget', 50, False),
+    'timeline': ('timeline', 50, False),
+    'message': ('message', None, True),
+    'contactMethod': ('contact_method', 20, False),
+}
+
+def validate_contact(data):
+    # Returns (fields, errors); fields are keyed by model column
+    fields, errors = {}, {}
+    for key, (column, max_length, required) in CONTACT_FIELDS.items():
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            value = str(value)
+        if required and not (value and value.strip()):
+            errors[key] = "Required"
+        elif value and max_length and len(value) > max_length:
+            errors[key] = f"At most {max_length} characters"
+        fields[column] = value
+    return fields, errors
+
 @api.route('/contact', methods=['POST'])
 def submit_contact():
-    data = request.get_json()
-    new_inquiry = ContactInquiry(
-        first_name=data.get('firstName'),
-        last_name=data.get('lastName'),
-        email=data.get('email'),
-        phone=data.get('phone'),
-        company=data.get('company'),
-        service_type=data.get('service'),
-        budget=data.get('budget'),
-        timeline=data.get('timeline'),
-        message=data.get('message'),
-        contact_method=data.get('contactMethod')
-    )
-    db.session.add(new_inquiry)
+    data = request.get_json(silent=True) or {}
+    fields, errors = validate_contact(data)
+    if errors:
+        return jsonify({"error": "Invalid submission", "fields": errors}), 400
+
+    # Write-behind mode: acknowledge once the submission is in the durable local journal
+    if contact_queue.enabled:
+        contact_queue.enqueue(fields)
+        return jsonify({"message": "Inquiry submitted"}), 202
+
+    db.session.add(ContactInquiry(**fields))
+    enqueue_inquiry_notification(fields)
     db.session.commit()
     return jsonify({"message": "Inquiry submitted"}), 201
 
-@api.route('/inquiries', methods=['GET'])
+@api.route('/contact/queue', methods=['GET'])
 @jwt_required()
-def get_inquiries():
-    inquiries = ContactInquiry.query.order_by(ContactInquiry.created_at.desc()).all()
-    return jsonify([{
+def get_contact_queue_stats():
+    return jsonify(contact_queue.stats())
+
+INQUIRY_STATUSES = ('pending', 'contacted', 'closed')
+
+# Read-only lists select just these columns as plain rows: no ORM instances, identity
+# map or attribute instrumentation per row. Rows have the same attribute names, so
+# the serializers below take either a row or a model instance.
+INQUIRY_SUMMARY_COLUMNS = (
+    ContactInquiry.id, ContactInquiry.first_name, ContactInquiry.last_name, ContactInquiry.email,
+    ContactInquiry.service_type, ContactInquiry.status, ContactInquiry.created_at
+)
+
+def serialize_inquiry_summary(i):
+    return {
         'id': i.id,
         'name': f"{i.first_name} {i.last_name}",
         'email': i.email,
         'service': i.service_type,
         'status': i.status,
         'date': i.created_at.isoformat()
-    } for i in inquiries])
+    }
 
-@api.route('/inquiries/<int:id>', methods=['GET'])
-@jwt_required()
-def get_inquiry_detail(id):
-    i = ContactInquiry.query.get_or_404(id)
-    return jsonify({
+def serialize_inquiry_detail(i):
+    return {
         'id': i.id,
         'firstName': i.first_name,
         'lastName': i.last_name,
@@ -209,8 +404,173 @@ def get_inquiry_detail(id):
         'contactMethod': i.contact_method,
         'status': i.status,
         'date': i.created_at.isoformat()
+    }
+
+def parse_date_arg(value, end_of_range=False):
+    # Accepts YYYY-MM-DD or a full ISO datetime; a bare end date covers the whole day
+    parsed = datetime.fromisoformat(value)
+    if end_of_range and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def inquiry_filters(args):
+    # SQL conditions for the status/from/to query parameters; raises ValueError on bad input
+    conditions = []
+    status = args.get('status')
+    if status:
+        if status not in INQUIRY_STATUSES:
+            raise ValueError(f"Invalid status, expected one of {', '.join(INQUIRY_STATUSES)}")
+        conditions.append(ContactInquiry.status == status)
+
+    try:
+        if args.get('from'):
+            conditions.append(ContactInquiry.created_at >= parse_date_arg(args['from']))
+        if args.get('to'):
+            conditions.append(ContactInquiry.created_at < parse_date_arg(args['to'], end_of_range=True))
+    except ValueError:
+        raise ValueError("Invalid date, expected YYYY-MM-DD or ISO 8601")
+    return conditions
+
+@api.route('/inquiries', methods=['GET'])
+@jwt_required()
+def get_inquiries():
+    try:
+        query = db.session.query(*INQUIRY_SUMMARY_COLUMNS).filter(*inquiry_filters(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Pagination is opt-in so existing clients keep receiving the full list
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        inquiries = query.order_by(ContactInquiry.created_at.desc()).all()
+        return jsonify([serialize_inquiry_summary(i) for i in inquiries])
+
+    try:
+        inquiries, next_cursor = keyset_page(
+            query, ContactInquiry,
+            cursor=request.args.get('cursor'),
+            limit=parse_limit(request.args.get('limit'))
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+    return jsonify({
+        'items': [serialize_inquiry_summary(i) for i in inquiries],
+        'next_cursor': next_cursor
     })
 
+@api.route('/inquiries/search', methods=['GET'])
+@jwt_required()
+def search_inquiries():
+    terms = search_terms(request.args.get('q'))
+    if not terms:
+        return jsonify({"error": "Missing search terms"}), 400
+    try:
+        conditions = inquiry_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        inquiries, next_cursor = ranked_search(
+            request.args['q'], conditions,
+            limit=parse_limit(request.args.get('limit')),
+            cursor=request.args.get('cursor')
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+    return jsonify({
+        'items': [{**serialize_inquiry_summary(i), 'excerpt': excerpt(i.message, terms)} for i in inquiries],
+        'next_cursor': next_cursor
+    })
+
+@api.route('/inquiries/export', methods=['GET'])
+@jwt_required()
+def export_inquiries():
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({"error": "Invalid format, expected csv or ndjson"}), 400
+    try:
+        conditions = inquiry_filters(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    statement = (
+        select(*ContactInquiry.__table__.columns)
+        .where(*conditions)
+        .order_by(ContactInquiry.created_at.desc(), ContactInquiry.id.desc())
+    )
+    chunks = stream_rows(statement)
+
+    if export_format == 'ndjson':
+        return Response(
+            stream_with_context(ndjson_stream(chunks, serialize_inquiry_detail)),
+            mimetype='application/x-ndjson',
+            headers={"Content-disposition": "attachment; filename=inquiries.ndjson"}
+        )
+    return Response(
+        stream_with_context(csv_stream(
+            ['ID', 'Prénom', 'Nom', 'Email', 'Téléphone', 'Entreprise', 'Service', 'Budget',
+             'Délai', 'Message', 'Méthode de contact', 'Statut', 'Date'],
+            chunks,
+            lambda i: [i.id, i.first_name, i.last_name, i.email, i.phone, i.company, i.service_type, i.budget,
+                       i.timeline, i.message, i.contact_method, i.status, i.created_at.strftime('%Y-%m-%d %H:%M:%S')]
+        )),
+        mimetype='text/csv',
+        headers={"Content-disposition": "attachment; filename=inquiries.csv"}
+    )
+
+# --- DASHBOARD ---
+@api.route('/dashboard/stats', methods=['GET'])
+@jwt_required()
+def get_dashboard_stats():
+    recent_count = max(1, min(request.args.get('recent', 5, type=int), 50))
+
+    # Counts are aggregated in SQL; only the grouped totals come back over the wire
+    inquiry_status = func.coalesce(ContactInquiry.status, 'pending')
+    inquiries_by_status = dict(
+        db.session.query(inquiry_status, func.count(ContactInquiry.id))
+        .group_by(inquiry_status).all()
+    )
+    projects_by_category = dict(
+        db.session.query(Project.category, func.count(Project.id))
+        .group_by(Project.category).all()
+    )
+    subscriber_total = db.session.query(func.count(NewsletterSubscriber.id)).scalar()
+    recent = ContactInquiry.query.order_by(
+        ContactInquiry.created_at.desc(), ContactInquiry.id.desc()
+    ).limit(recent_count).all()
+
+    return jsonify({
+        'inquiries': {
+            'total': sum(inquiries_by_status.values()),
+            'by_status': {**dict.fromkeys(INQUIRY_STATUSES, 0), **inquiries_by_status}
+        },
+        'projects': {
+            'total': sum(projects_by_category.values()),
+            'by_category': projects_by_category
+        },
+        'subscribers': {
+            'total': subscriber_total
+        },
+        'recent_inquiries': [serialize_inquiry_summary(i) for i in recent]
+    })
+
+@api.route('/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    # Counters are per worker process
+    return jsonify(response_cache.stats())
+
+@api.route('/db/pool', methods=['GET'])
+@jwt_required()
+def get_db_pool_stats():
+    # Counters are per worker process
+    return jsonify(pool_metrics.stats())
+
+@api.route('/inquiries/<int:id>', methods=['GET'])
+@jwt_required()
+def get_inquiry_detail(id):
+    i = ContactInquiry.query.get_or_404(id)
+    return jsonify(serialize_inquiry_detail(i))
+
 @api.route('/inquiries/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_inquiry_status(id):
@@ -220,10 +580,13 @@ def update_inquiry_status(id):
     db.session.commit()
     return jsonify({"message": "Status updated"})
 
-@api.route('/services', methods=['GET'])
-def get_services():
-    services = Service.query.all()
-    return jsonify([{
+SERVICE_COLUMNS = (
+    Service.id, Service.name, Service.delay, Service.starting_price,
+    Service.roi, Service.icon_type, Service.details_anchor
+)
+
+def serialize_service(s):
+    return {
         'id': s.id,
         'name': s.name,
         'delay': s.delay,
@@ -231,7 +594,14 @@ def get_services():
         'roi': s.roi,
         'icon': s.icon_type,
         'anchor': s.details_anchor
-    } for s in services])
+    }
+
+@api.route('/services', methods=['GET'])
+@conditional('services')
+@cached('services', version=version_key)
+def get_services():
+    services = db.session.query(*SERVICE_COLUMNS).all()
+    return jsonify([serialize_service(s) for s in services])
 
 @api.route('/services', methods=['POST'])
 @jwt_required()
@@ -273,50 +643,69 @@ def update_service(id):
 @api.route('/newsletter', methods=['POST'])
 def subscribe():
     data = request.get_json()
-    email = data.get('email')
-    if NewsletterSubscriber.query.filter_by(email=email).first():
+    email = normalize_email(data.get('email'))
+    if not is_valid_email(email):
+        return jsonify({"error": "Invalid email"}), 400
+
+    if not subscribe_email(email):
         return jsonify({"message": "Already subscribed"}), 200
-    
-    new_sub = NewsletterSubscriber(email=email)
-    db.session.add(new_sub)
-    db.session.commit()
     return jsonify({"message": "Subscribed successfully"}), 201
 
-@api.route('/newsletter', methods=['GET'])
-@jwt_required()
-def get_subscribers():
-    subs = NewsletterSubscriber.query.order_by(NewsletterSubscriber.created_at.desc()).all()
-    return jsonify([{
+SUBSCRIBER_COLUMNS = (NewsletterSubscriber.id, NewsletterSubscriber.email, NewsletterSubscriber.created_at)
+
+def serialize_subscriber(s):
+    return {
         'id': s.id,
         'email': s.email,
         'date': s.created_at.isoformat()
-    } for s in subs])
+    }
+
+@api.route('/newsletter', methods=['GET'])
+@jwt_required()
+def get_subscribers():
+    subs = (
+        db.session.query(*SUBSCRIBER_COLUMNS)
+        .order_by(NewsletterSubscriber.created_at.desc()).all()
+    )
+    return jsonify([serialize_subscriber(s) for s in subs])
+
+@api.route('/newsletter/import', methods=['POST'])
+@jwt_required()
+def import_subscribers():
+    # Accepts a CSV/JSON file upload ("file") or a JSON body {"emails": [...]}
+    upload = request.files.get('file')
+    try:
+        if upload:
+            raw_emails = parse_email_upload(upload.read(), upload.filename or '')
+        else:
+            body = request.get_json(silent=True)
+            raw_emails = body.get('emails') if isinstance(body, dict) else None
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({"error": f"Could not parse upload: {str(e)}"}), 400
+    if not isinstance(raw_emails, list):
+        return jsonify({"error": "Expected a CSV/JSON file or a JSON body with an 'emails' list"}), 400
+
+    try:
+        report = bulk_import(raw_emails)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+    return jsonify(report), 200
 
 @api.route('/newsletter/export', methods=['GET'])
 @jwt_required()
 def export_subscribers():
-    import csv
-    import io
-    from flask import Response
-    
-    subs = NewsletterSubscriber.query.order_by(NewsletterSubscriber.created_at.desc()).all()
-    
-    def generate():
-        data = io.StringIO()
-        writer = csv.writer(data)
-        writer.writerow(['ID', 'Email', 'Date d\'abonnement'])
-        yield data.getvalue()
-        data.seek(0)
-        data.truncate(0)
-        
-        for s in subs:
-            writer.writerow([s.id, s.email, s.created_at.strftime('%Y-%m-%d %H:%M:%S')])
-            yield data.getvalue()
-            data.seek(0)
-            data.truncate(0)
-            
+    # Rows are fetched in chunks through a server-side cursor while the response streams
+    statement = (
+        select(NewsletterSubscriber.id, NewsletterSubscriber.email, NewsletterSubscriber.created_at)
+        .order_by(NewsletterSubscriber.created_at.desc())
+    )
     return Response(
-        generate(),
+        stream_with_context(csv_stream(
+            ['ID', 'Email', 'Date d\'abonnement'],
+            stream_rows(statement),
+            lambda s: [s.id, s.email, s.created_at.strftime('%Y-%m-%d %H:%M:%S')]
+        )),
         mimetype='text/csv',
         headers={"Content-disposition": "attachment; filename=subscribers.csv"}
     )
@@ -0,0 +1,151 @@
+import base64
+import re
+from sqlalchemy import event, func, literal_column, or_, table, column
+from models import db, ContactInquiry
+from pagination import InvalidCursor
+
+# Columns covered by the inbox search, in ranking order
+SEARCH_COLUMNS = ('first_name', 'last_name', 'email', 'company', 'message')
+FTS_TABLE = 'contact_inquiry_fts'
+MAX_TERMS = 8
+TERM_RE = re.compile(r'\w+')
+
+# --- INDEX DDL ---
+# Postgres: a generated tsvector column, so every INSERT/UPDATE (ORM, bulk insert or
+# the contact queue flush) keeps it current without triggers. Names and email weigh
+# most, then company, then the message. Email is split on punctuation so "example"
+# or "jean.pierre" find it.
+POSTGRES_DDL = [
+    """
+    ALTER TABLE contact_inquiry ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A') ||
+        setweight(to_tsvector('simple', regexp_replace(coalesce(email, ''), '[@._+-]', ' ', 'g')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(message, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_contact_inquiry_search_vector ON contact_inquiry USING GIN (search_vector)",
+]
+
+# SQLite: an external-content FTS5 table (the text is not stored twice) kept in sync
+# by triggers. Status changes don't touch indexed columns, so they skip the reindex.
+SQLITE_DDL = [
+    *[f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}" for suffix in ('ai', 'ad', 'au')],
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        first_name, last_name, email, company, message,
+        content='contact_inquiry', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON contact_inquiry BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email, company, message)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.company, new.message);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON contact_inquiry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email, company, message)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.company, old.message);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF first_name, last_name, email, company, message ON contact_inquiry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, first_name, last_name, email, company, message)
+        VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.company, old.message);
+        INSERT INTO {FTS_TABLE}(rowid, first_name, last_name, email, company, message)
+        VALUES (new.id, new.first_name, new.last_name, new.email, new.company, new.message);
+    END
+    """,
+    # Index any rows that already exist
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+@event.listens_for(ContactInquiry.__table__, 'after_create')
+def create_search_index(target, connection, **kw):
+    # Lets db.create_all() (local SQLite, check scripts) build the index; real databases get it from the migration
+    ddl = {'postgresql': POSTGRES_DDL, 'sqlite': SQLITE_DDL}.get(connection.dialect.name, [])
+    for statement in ddl:
+        connection.exec_driver_sql(statement)
+
+@event.listens_for(ContactInquiry.__table__, 'before_drop')
+def drop_search_index(target, connection, **kw):
+    # The trigger-fed FTS table would otherwise outlive the table it indexes
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Keep autogenerate from proposing to drop the search index, which the models don't declare
+    if type_ == 'table' and name.startswith(FTS_TABLE):
+        return False
+    if type_ == 'column' and name == 'search_vector':
+        return False
+    if type_ == 'index' and name == 'ix_contact_inquiry_search_vector':
+        return False
+    return True
+
+# --- QUERIES ---
+def search_terms(q):
+    # Only word characters reach the index, so user input can't inject tsquery/FTS5 syntax
+    return [term.lower() for term in TERM_RE.findall(q or '')][:MAX_TERMS]
+
+def excerpt(text, terms, width=160):
+    # The part of the message around the first matching term, for the result list
+    text = ' '.join((text or '').split())
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms if lowered.find(term) >= 0]
+    start = max(0, min(positions) - width // 4) if positions else 0
+    snippet = text[start:start + width]
+    return ('…' if start else '') + snippet + ('…' if start + width < len(text) else '')
+
+def encode_offset(offset):
+    return base64.urlsafe_b64encode(f"search|{offset}".encode()).decode().rstrip('=')
+
+def decode_offset(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        prefix, offset = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        if prefix != 'search' or int(offset) < 0:
+            raise ValueError(cursor)
+        return int(offset)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(cursor) from e
+
+def ranked_search(q, conditions, limit, cursor=None):
+    """Best matches first for every term of `q` (each term matches as a prefix).
+
+    Ranked results have no stable seek key, so unlike keyset_page the cursor
+    carries an offset; with the index doing the matching, only the matching
+    rows are ranked. Returns (rows, next_cursor).
+    """
+    terms = search_terms(q)
+    offset = decode_offset(cursor) if cursor else 0
+    query = ContactInquiry.query.filter(*conditions)
+    dialect = db.engine.dialect.name
+
+    if dialect == 'postgresql':
+        tsquery = func.to_tsquery('simple', ' & '.join(f"{term}:*" for term in terms))
+        vector = literal_column('contact_inquiry.search_vector')
+        query = query.filter(vector.op('@@')(tsquery)).order_by(
+            func.ts_rank_cd(vector, tsquery).desc(), ContactInquiry.id.desc()
+        )
+    elif dialect == 'sqlite':
+        fts = table(FTS_TABLE, column('rowid'))
+        match = ' '.join(f'"{term}"*' for term in terms)
+        query = query.join(fts, fts.c.rowid == ContactInquiry.id).filter(
+            literal_column(FTS_TABLE).op('MATCH')(match)
+        ).order_by(
+            # bm25 is lower for better matches; weights follow SEARCH_COLUMNS
+            func.bm25(literal_column(FTS_TABLE), 10.0, 10.0, 10.0, 5.0, 1.0), ContactInquiry.id.desc()
+        )
+    else:
+        # No text index on other databases: every term must appear in some column
+        for term in terms:
+            query = query.filter(or_(*[getattr(ContactInquiry, name).ilike(f"%{term}%") for name in SEARCH_COLUMNS]))
+        query = query.order_by(ContactInquiry.created_at.desc(), ContactInquiry.id.desc())
+
+    rows = query.offset(offset).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_offset(offset + limit)
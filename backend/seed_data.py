@@ -0,0 +1,169 @@
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Ensure current directory is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from models import db, Project, ProjectImage, ProjectMetric, ContactInquiry, NewsletterSubscriber
+from versioning import bump_version
+from cache import response_cache
+from init_services import init_services
+
+# Synthetic, reproducible data for load and benchmark runs: the same --seed and
+# volumes always produce the same rows, on SQLite or Postgres (DATABASE_URL).
+SCALES = {
+    'small': {'projects': 50, 'images': 4, 'metrics': 3, 'inquiries': 1000, 'subscribers': 500},
+    'medium': {'projects': 500, 'images': 6, 'metrics': 3, 'inquiries': 20000, 'subscribers': 10000},
+    'large': {'projects': 2000, 'images': 8, 'metrics': 4, 'inquiries': 200000, 'subscribers': 100000},
+}
+BATCH_SIZE = 1000
+HISTORY_DAYS = 730
+
+CATEGORIES = ['Site Web', 'Photographie', 'Design Graphique', 'Community Management']
+INDUSTRIES = ['ecommerce', 'restaurant', 'sante', 'education', 'immobilier', 'tourisme', 'finance', 'mode']
+SERVICE_TYPES = ['website', 'photography', 'community', 'graphic', 'content', 'multiple', 'other']
+BUDGETS = ['under-50k', '50k-100k', '100k-200k', '200k-500k', 'over-500k', 'flexible']
+TIMELINES = ['urgent', 'short', 'medium', 'long', 'flexible']
+CONTACT_METHODS = ['email', 'phone', 'whatsapp']
+STATUSES = ['pending', 'pending', 'contacted', 'closed']
+FIRST_NAMES = ['Jean', 'Marie', 'Pierre', 'Nadège', 'Samuel', 'Fabienne', 'Jacques', 'Roseline', 'Wilson', 'Esther']
+LAST_NAMES = ['Joseph', 'Pierre', 'Louis', 'Jean-Baptiste', 'Charles', 'Francois', 'Etienne', 'Noel', 'Celestin', 'Desir']
+METRIC_LABELS = ['Augmentation des Ventes', 'Trafic Mensuel', 'Taux de Conversion', 'Abonnés Gagnés', 'Temps de Chargement']
+WORDS = ('projet client site boutique photo campagne marque refonte identité visuelle contenu réseaux '
+         'lancement produit événement restaurant hôtel clinique école').split()
+IMAGE_BASE = 'https://res.cloudinary.com/demo/image/upload/cvisual/seed'
+SEEDED_TABLES = [ProjectImage, ProjectMetric, Project, ContactInquiry, NewsletterSubscriber]
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def created_at(rng, now):
+    return now - timedelta(seconds=rng.randint(0, HISTORY_DAYS * 86400))
+
+def insert_batches(model, rows):
+    rows = iter(rows)
+    inserted = 0
+    while True:
+        batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+        if not batch:
+            return inserted
+        db.session.execute(model.__table__.insert(), batch)
+        inserted += len(batch)
+
+def seed_projects(rng, count, images, metrics, now):
+    projects = []
+    for i in range(count):
+        created = created_at(rng, now)
+        projects.append({
+            'title': f"{sentence(rng, 3)[:-1]} #{i + 1}",
+            'category': rng.choice(CATEGORIES),
+            'industry': rng.choice(INDUSTRIES),
+            'date': created.strftime('%m/%Y'),
+            'client': f"{rng.choice(LAST_NAMES)} & Co",
+            'duration': f"{rng.randint(1, 12)} semaines",
+            'main_image': f"{IMAGE_BASE}/project-{i + 1}.jpg",
+            'challenge': sentence(rng, 30),
+            'solution': sentence(rng, 40),
+            'testimonial_text': sentence(rng, 20),
+            'testimonial_author': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            'testimonial_role': 'Directeur',
+            'live_link': f"https://example.com/projet-{i + 1}" if rng.random() < 0.5 else None,
+            'created_at': created,
+        })
+    insert_batches(Project, projects)
+
+    # Ids are assigned by the database; fetch the ones just inserted
+    ids = [pid for (pid,) in db.session.query(Project.id).order_by(Project.id.desc()).limit(count)]
+    insert_batches(ProjectImage, (
+        {'project_id': pid, 'image_url': f"{IMAGE_BASE}/project-{pid}-{n}.jpg"}
+        for pid in ids for n in range(images)
+    ))
+    insert_batches(ProjectMetric, (
+        {'project_id': pid, 'label': rng.choice(METRIC_LABELS), 'value': f"+{rng.randint(10, 400)}%"}
+        for pid in ids for _ in range(metrics)
+    ))
+    return len(ids)
+
+def seed_inquiries(rng, count, now):
+    def rows():
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                'first_name': first,
+                'last_name': last,
+                'email': f"{first.lower()}.{last.lower()}.{i}@example.com",
+                'phone': f"+509 {rng.randint(3000, 4999)} {rng.randint(1000, 9999)}",
+                'company': f"{last} SA" if rng.random() < 0.6 else None,
+                'service_type': rng.choice(SERVICE_TYPES),
+                'budget': rng.choice(BUDGETS),
+                'timeline': rng.choice(TIMELINES),
+                'message': sentence(rng, rng.randint(10, 80)),
+                'contact_method': rng.choice(CONTACT_METHODS),
+                'status': rng.choice(STATUSES),
+                'created_at': created_at(rng, now),
+            }
+    return insert_batches(ContactInquiry, rows())
+
+def seed_subscribers(rng, count, now):
+    # Offset by the current row count so repeated runs never collide on the unique email
+    offset = db.session.query(db.func.count(NewsletterSubscriber.id)).scalar()
+    return insert_batches(NewsletterSubscriber, (
+        {'email': f"abonne{offset + i}@example.com", 'created_at': created_at(rng, now)}
+        for i in range(count)
+    ))
+
+def seed(projects, images, metrics, inquiries, subscribers, seed=42, reset=False):
+    rng = random.Random(seed)
+    # Fixed reference time so a given seed always yields the same dates
+    now = datetime(2026, 1, 1)
+    with app.app_context():
+        db.create_all()
+        if reset:
+            for model in SEEDED_TABLES:
+                db.session.execute(model.__table__.delete())
+            db.session.commit()
+            print("Cleared seeded tables.")
+
+        started = time.perf_counter()
+        counts = {
+            'projects': seed_projects(rng, projects, images, metrics, now),
+            'images': projects * images,
+            'metrics': projects * metrics,
+            'inquiries': seed_inquiries(rng, inquiries, now),
+            'subscribers': seed_subscribers(rng, subscribers, now),
+        }
+        # Bulk inserts skip the ORM flush hook, so bump the public versions by hand
+        bump_version(db.session.connection(), 'portfolio')
+        db.session.commit()
+        response_cache.invalidate('portfolio')
+
+    init_services()
+    print(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the database with synthetic projects, inquiries and subscribers")
+    parser.add_argument('--scale', choices=SCALES, default='small', help="Preset volumes, overridable below")
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--images', type=int, help="Gallery images per project")
+    parser.add_argument('--metrics', type=int, help="Metrics per project")
+    parser.add_argument('--inquiries', type=int)
+    parser.add_argument('--subscribers', type=int)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--reset', action='store_true', help="Delete existing projects, inquiries and subscribers first")
+    args = parser.parse_args()
+
+    volumes = dict(SCALES[args.scale])
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+    print(f"Database: {app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1]}")
+    seed(seed=args.seed, reset=args.reset, **volumes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import re
+from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from models import db, NewsletterSubscriber
+
+IMPORT_BATCH_SIZE = 1000
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def normalize_email(email):
+    return email.strip().lower() if isinstance(email, str) else ''
+
+def is_valid_email(email):
+    return len(email) <= 120 and EMAIL_RE.match(email) is not None
+
+def insert_ignoring_duplicates(table):
+    # ON CONFLICT DO NOTHING on Postgres, the equivalent INSERT OR IGNORE behaviour on SQLite.
+    # No conflict target, so both the email constraint and the lower(email) index are covered.
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing()
+    return table.insert().prefix_with('IGNORE') # MySQL/MariaDB
+
+def subscribe_email(email):
+    """Insert one subscriber in a single atomic statement.
+
+    Returns True if the email was new, False if it was already subscribed.
+    Concurrent calls for the same address cannot race into an IntegrityError
+    because the unique index arbitrates inside the database.
+    """
+    statement = insert_ignoring_duplicates(NewsletterSubscriber.__table__).values(
+        email=email, created_at=datetime.utcnow()
+    )
+    result = db.session.execute(statement)
+    db.session.commit()
+    return result.rowcount == 1
+
+def parse_email_upload(data, filename=''):
+    """Pull raw email strings out of an uploaded CSV or JSON document."""
+    text = data.decode('utf-8-sig') if isinstance(data, bytes) else data
+    if filename.lower().endswith('.json') or text.lstrip()[:1] in ('[', '{'):
+        payload = json.loads(text)
+        if isinstance(payload, dict):
+            payload = payload.get('emails', [])
+        if not isinstance(payload, list):
+            raise ValueError("Expected a JSON list of emails, or an object with an 'emails' list")
+        return [item.get('email') if isinstance(item, dict) else item for item in payload]
+
+    rows = list(csv.reader(io.StringIO(text)))
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if 'email' in header:
+        column = header.index('email')
+        return [row[column] for row in rows[1:] if len(row) > column]
+    return [row[0] for row in rows if row]
+
+def bulk_import(raw_emails):
+    """Normalise, dedupe and batch-insert emails; returns the import report."""
+    seen = set()
+    invalid = []
+    for raw in raw_emails:
+        email = normalize_email(raw)
+        if not is_valid_email(email):
+            invalid.append(raw)
+        else:
+            seen.add(email)
+
+    emails = sorted(seen)
+    statement = insert_ignoring_duplicates(NewsletterSubscriber.__table__)
+    now = datetime.utcnow()
+    inserted = 0
+    for start in range(0, len(emails), IMPORT_BATCH_SIZE):
+        batch = emails[start:start + IMPORT_BATCH_SIZE]
+        # One multi-row INSERT per batch; rowcount only counts rows that were not already present
+        result = db.session.execute(statement.values([{'email': e, 'created_at': now} for e in batch]))
+        inserted += result.rowcount
+    db.session.commit()
+
+    return {
+        'received': len(raw_emails),
+        'inserted': inserted,
+        'duplicates': len(raw_emails) - len(invalid) - inserted,
+        'invalid': len(invalid),
+        'invalid_samples': [str(e) for e in invalid[:20]]
+    }
@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from flask import current_app
+
+SIGNATURE_TTL = 3600
+
+_cloudinary_configured = False
+
+def cloudinary_config():
+    """Configure the Cloudinary SDK from the app config on first use and return its config.
+
+    The SDK is only imported once an upload, signature or URL check needs it,
+    which keeps it off the cold-start path.
+    """
+    global _cloudinary_configured
+    import cloudinary
+    if not _cloudinary_configured:
+        config = current_app.config
+        if config.get('CLOUDINARY_URL'):
+            # cloudinary://<api_key>:<api_secret>@<cloud_name>; config(cloudinary_url=...) does not parse it
+            parsed = urlsplit(config['CLOUDINARY_URL'])
+            cloudinary.config(cloud_name=parsed.hostname, api_key=parsed.username, api_secret=parsed.password)
+        elif all([config.get('CLOUDINARY_CLOUD_NAME'), config.get('CLOUDINARY_API_KEY'), config.get('CLOUDINARY_API_SECRET')]):
+            cloudinary.config(
+                cloud_name=config['CLOUDINARY_CLOUD_NAME'],
+                api_key=config['CLOUDINARY_API_KEY'],
+                api_secret=config['CLOUDINARY_API_SECRET']
+            )
+        else:
+            print("WARNING: No valid Cloudinary configuration found (CLOUDINARY_URL or CLOUDINARY_CLOUD_NAME/API_KEY/API_SECRET)")
+        _cloudinary_configured = True
+    return cloudinary.config()
+
+def cloudinary_upload(file, folder):
+    import cloudinary.uploader
+    return cloudinary.uploader.upload(file, folder=folder).get('secure_url')
+
+def get_uploader():
+    # IMAGE_UPLOADER lets tests and local runs swap in a fake with the same signature
+    uploader = current_app.config.get('IMAGE_UPLOADER')
+    if uploader is None:
+        cloudinary_config() # Needs the app context, which upload threads don't have
+        uploader = cloudinary_upload
+    return uploader
+
+def upload_many(files, folder):
+    """Upload files concurrently through a bounded thread pool.
+
+    Returns one (filename, url, error) tuple per file, in input order;
+    a failed upload has url None and the exception message as error.
+    """
+    uploader = get_uploader() # Resolved here: worker threads have no app context
+    max_workers = current_app.config.get('UPLOAD_CONCURRENCY', 4)
+
+    def upload_one(file):
+        try:
+            return file.filename, uploader(file, folder), None
+        except Exception as e:
+            return file.filename, None, str(e)
+
+    files = [f for f in files if f]
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as pool:
+        return list(pool.map(upload_one, files))
+
+def sign_upload(folder):
+    """Short-lived signed parameters for a direct browser-to-Cloudinary upload.
+
+    Returns None when Cloudinary credentials are not configured.
+    """
+    import cloudinary.utils
+    config = cloudinary_config()
+    if not all([config.cloud_name, config.api_key, config.api_secret]):
+        return None
+
+    timestamp = int(time.time())
+    params = {'folder': folder, 'timestamp': timestamp}
+    return {
+        'upload_url': f"https://api.cloudinary.com/v1_1/{config.cloud_name}/image/upload",
+        'api_key': config.api_key,
+        'folder': folder,
+        'timestamp': timestamp,
+        'signature': cloudinary.utils.api_sign_request(params, config.api_secret),
+        # Cloudinary rejects signed requests older than one hour
+        'expires_at': timestamp + SIGNATURE_TTL
+    }
+
+def is_hosted_image(url):
+    # Only record URLs that point at our own Cloudinary account
+    cloud_name = cloudinary_config().cloud_name
+    return bool(cloud_name) and isinstance(url, str) and url.startswith(f"https://res.cloudinary.com/{cloud_name}/")
@@ -0,0 +1,108 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import request, make_response, has_request_context
+from sqlalchemy import event, select
+from models import db, Project, ProjectImage, ProjectMetric, Service, ContentVersion
+from cache import response_cache
+
+# Which public resource each model feeds into
+TRACKED_MODELS = {
+    Project: 'portfolio',
+    ProjectImage: 'portfolio',
+    ProjectMetric: 'portfolio',
+    Service: 'services',
+}
+
+def _touched_resources(session):
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = TRACKED_MODELS.get(type(obj))
+        if name:
+            touched.add(name)
+    return touched
+
+def bump_version(connection, name):
+    # Also used by writers that bypass the ORM (e.g. seed_data.py's bulk inserts)
+    table = ContentVersion.__table__
+    now = datetime.utcnow()
+    result = connection.execute(
+        table.update()
+        .where(table.c.name == name)
+        .values(version=table.c.version + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(name=name, version=1, updated_at=now))
+
+@event.listens_for(db.session, 'before_flush')
+def bump_versions(session, flush_context, instances):
+    # Runs inside the writer's transaction, so the bump commits (or rolls back) with the data
+    connection = session.connection()
+    touched = _touched_resources(session)
+    session.info.setdefault('touched_resources', set()).update(touched)
+    for name in touched:
+        bump_version(connection, name)
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_cached_responses(session):
+    for name in session.info.pop('touched_resources', ()):
+        response_cache.invalidate(name)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_touched_resources(session):
+    session.info.pop('touched_resources', None)
+
+def current_version(name):
+    # Memoised per request: the conditional and cache layers both need it
+    versions = request.environ.setdefault('cvisual.content_versions', {}) if has_request_context() else {}
+    if name not in versions:
+        # Column query rather than session.get, so a long-lived session never sees a stale row
+        row = db.session.execute(
+            select(ContentVersion.version, ContentVersion.updated_at).where(ContentVersion.name == name)
+        ).first()
+        versions[name] = tuple(row) if row else (0, None)
+    return versions[name]
+
+def version_key(name):
+    return current_version(name)[0]
+
+def conditional(name):
+    """Serve 304 Not Modified while the resource's version is unchanged.
+
+    The handler only runs when the client's copy is stale, so unchanged data
+    skips the query and serialization work entirely.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version, updated_at = current_version(name)
+            # The path (one item or the list), filters and cursors change the body, so they are part of the tag
+            etag = hashlib.sha1(f"{name}:{version}:{request.path}?{request.query_string.decode()}".encode()).hexdigest()
+            last_modified = updated_at.replace(microsecond=0) if updated_at else None
+            # HTTP dates have whole seconds: while the version is from the current second, a later
+            # edit in that same second would look unmodified, so only the ETag validates until then
+            if last_modified and last_modified >= datetime.utcnow().replace(microsecond=0):
+                last_modified = None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag) # Compressed responses carry it as W/"..."
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since.replace(tzinfo=None))
+
+            if not_modified:
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # Weak on the 200 and the 304 alike: compression re-encodes the body, so the bytes vary by encoding
+            response.set_etag(etag, weak=True)
+            if last_modified:
+                response.last_modified = last_modified
+            # Clients may keep the copy but must revalidate before reusing it
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
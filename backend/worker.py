@@ -0,0 +1,47 @@
+import os
+import signal
+import sys
+import time
+
+# Ensure current directory is in path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import app
+from jobs import claim_next, run_job, requeue_stale
+
+POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2))
+
+running = True
+
+def stop(signum, frame):
+    # Finish the current job, then exit
+    global running
+    running = False
+
+def work():
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Job worker started (pid {os.getpid()}), polling every {POLL_INTERVAL}s")
+
+    last_stale_check = 0
+    while running:
+        with app.app_context():
+            try:
+                if time.monotonic() - last_stale_check > 60:
+                    requeued = requeue_stale()
+                    if requeued:
+                        print(f"Requeued {requeued} stale job(s)")
+                    last_stale_check = time.monotonic()
+
+                job = claim_next()
+                if job is not None:
+                    ok = run_job(job)
+                    print(f"Job {job.id} ({job.kind}) {'done' if ok else job.status} after {job.attempts} attempt(s)")
+                    continue
+            except Exception as e:
+                print(f"Job worker error: {e}")
+        time.sleep(POLL_INTERVAL)
+    print("Job worker stopped")
+
+if __name__ == "__main__":
+    work()